@@ -2,8 +2,8 @@
 Dashboard API endpoints - Analytics and monitoring data
 """
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
-from fastapi import APIRouter, Depends, Query
+from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 
@@ -285,14 +285,25 @@ def get_ai_performance_metrics(
 @router.get("/recent-activity")
 def get_recent_activity(
     limit: int = Query(20, ge=1, le=100),
+    before_created_at: Optional[datetime] = Query(None),
+    before_id: Optional[int] = Query(None),
     db: Session = Depends(get_db)
 ):
     """
     Get recent system activity for the activity feed.
+    Pass the previous response's next_cursor as before_created_at/before_id for older pages.
     """
     
+    if (before_created_at is None) != (before_id is None):
+        raise HTTPException(
+            status_code=422,
+            detail="before_created_at and before_id must be supplied together"
+        )
+    
     logger = SystemLogger(db)
-    recent_events = logger.get_recent_events(limit=limit)
+    before = (before_created_at, before_id) if before_created_at is not None else None
+    recent_events = logger.get_recent_events(limit=limit, before=before)
+    next_cursor = logger.get_events_cursor(recent_events, limit)
     
     activity_feed = []
     for event in recent_events:
@@ -319,7 +330,11 @@ def get_recent_activity(
     
     return {
         "recent_activity": activity_feed,
-        "total_events": len(activity_feed)
+        "total_events": len(activity_feed),
+        "next_cursor": {
+            "before_created_at": next_cursor[0].isoformat(),
+            "before_id": next_cursor[1]
+        } if next_cursor else None
     }
 
 
@@ -327,10 +342,12 @@ def get_recent_activity(
 def export_dashboard_data(
     days: int = Query(30, ge=1, le=365),
     include_messages: bool = Query(False),
+    include_errors: bool = Query(False),
     db: Session = Depends(get_db)
 ):
     """
     Export comprehensive dashboard data for external analysis.
+    With include_errors, the error events of the period are exported as well.
     """
     
     end_date = datetime.utcnow()
@@ -384,15 +401,35 @@ def export_dashboard_data(
         for exp in explainers
     ]
     
+    export_data = {
+        "leads": leads_data,
+        "financial_explainers": explainers_data,
+        "summary": {
+            "total_leads": len(leads_data),
+            "total_explainers": len(explainers_data)
+        }
+    }
+    
+    if include_errors:
+        # Streamed from the cursor, since the error log can be large over long periods
+        logger = SystemLogger(db)
+        export_data["error_events"] = [
+            {
+                "id": event.id,
+                "event_type": event.event_type,
+                "category": event.category,
+                "details": event.details,
+                "severity": event.severity,
+                "processed": event.processed,
+                "lead_id": event.lead_id,
+                "created_at": event.created_at.isoformat()
+            }
+            for event in logger.iter_error_events(hours=days * 24)
+        ]
+        export_data["summary"]["total_error_events"] = len(export_data["error_events"])
+    
     return {
         "export_date": datetime.utcnow().isoformat(),
         "period_days": days,
-        "data": {
-            "leads": leads_data,
-            "financial_explainers": explainers_data,
-            "summary": {
-                "total_leads": len(leads_data),
-                "total_explainers": len(explainers_data)
-            }
-        }
+        "data": export_data
     }
\ No newline at end of file
@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(..., env="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-4o-mini", env="OPENAI_MODEL")
     openai_temperature: float = Field(default=0.7, env="OPENAI_TEMPERATURE")
+    openai_classifier_model: str = Field(default="gpt-4o-mini", env="OPENAI_CLASSIFIER_MODEL")
     
     # Security
     secret_key: str = Field(..., env="SECRET_KEY")
@@ -29,6 +30,7 @@ class Settings(BaseSettings):
     risk_analysis_interval_minutes: int = Field(default=15, env="RISK_ANALYSIS_INTERVAL_MINUTES")
     sentiment_threshold_at_risk: float = Field(default=-0.3, env="SENTIMENT_THRESHOLD_AT_RISK")
     response_time_threshold_hours: int = Field(default=24, env="RESPONSE_TIME_THRESHOLD_HOURS")
+    lead_scan_concurrency: int = Field(default=5, env="LEAD_SCAN_CONCURRENCY")
     
     # Cold Lead Outreach Configuration
     cold_lead_cooldown_days: int = Field(default=14, env="COLD_LEAD_COOLDOWN_DAYS")
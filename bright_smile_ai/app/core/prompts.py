@@ -2,6 +2,7 @@
 Comprehensive LLM prompts for the AI Patient Advocate system.
 These prompts define the personality, behavior, and responses for both AI agents.
 """
+from functools import lru_cache
 
 # ========================================================================
 # SYSTEM PROMPTS - Core personality and behavior guidelines
@@ -272,18 +273,93 @@ RESPONSE ELEMENTS:
 TONE: Professional, efficient, and reassuring. Make the handoff feel seamless and well-coordinated.
 """
 
+# ========================================================================
+# RISK ANALYZER PROMPTS - Opportunity scanning and retention
+# ========================================================================
+
+LEAD_OPPORTUNITY_ANALYSIS_PROMPT = """
+You are an AI lead analysis expert for a dental practice. Analyze this lead to determine if there's an opportunity for proactive engagement.
+
+LEAD INFORMATION:
+- Name: {lead_name}
+- Status: {lead_status}
+- Risk Level: {risk_level}
+- Initial Inquiry: {initial_inquiry}
+- Days Since Creation: {days_since_creation}
+- Sentiment Score: {sentiment_score}
+
+RECENT CONVERSATION:
+{conversation_history}
+
+AVAILABLE OFFERS:
+{relevant_offers}
+
+ANALYSIS TASK:
+Determine if this lead presents an opportunity for proactive engagement. Consider:
+1. Are they showing buying signals?
+2. Could they benefit from a specific offer?
+3. Are they at risk of going cold?
+4. Would proactive outreach add value?
+"""
+
+PROACTIVE_ENGAGEMENT_PROMPT = """
+You are a dental practice AI assistant. Create a proactive engagement message for this lead.
+
+LEAD CONTEXT:
+- Name: {lead_name}
+- Initial Interest: {initial_interest}
+- Opportunity: {opportunity}
+- Recommended Offer: {recommended_offer}
+- Urgency: {urgency_level}
+
+MESSAGE REQUIREMENTS:
+- Be warm and helpful, not pushy
+- Reference their specific interest
+- Include the recommended offer if applicable
+- Make it easy for them to respond
+- Keep it under 150 words
+
+Create a natural, engaging message that feels like a helpful follow-up from a caring dental practice.
+"""
+
+AGGRESSIVE_RETENTION_PROMPT = """
+You are a dental practice AI assistant. Create an AGGRESSIVE retention message for a high-risk lead who is about to be lost.
+
+LEAD CONTEXT:
+- Name: {lead_name}
+- Risk Factors: {risk_factors}
+- Sentiment Trend: {sentiment_trend}
+- Days Since Last Contact: {days_since_last_contact}
+
+AVAILABLE OFFERS:
+{relevant_offers}
+
+MESSAGE REQUIREMENTS:
+- Be URGENT but not desperate
+- Address their specific risk factors
+- Present the most compelling offer prominently
+- Create a sense of urgency and value
+- Make it impossible to ignore
+- Keep it under 200 words
+- Use emotional language that connects with dental anxiety
+
+This lead is about to be lost - you need to save them with an irresistible offer!
+"""
+
 # ========================================================================
 # PROMPT FORMATTING FUNCTIONS
 # ========================================================================
 
+@lru_cache(maxsize=None)
+def _with_system_base(prompt_template: str) -> str:
+    """Substitute the (constant) system base prompt into a template once per template."""
+    return prompt_template.replace("{system_base}", SYSTEM_BASE_PROMPT)
+
 def format_system_prompt(prompt_template: str, **kwargs) -> str:
     """
     Format a prompt template with the system base prompt and provided context.
     """
-    return prompt_template.format(
-        system_base=SYSTEM_BASE_PROMPT,
-        **kwargs
-    )
+    return _with_system_base(prompt_template).format(**kwargs)
 
 def get_intent_classification_prompt(latest_message: str, conversation_history: str) -> str:
     """Get the formatted intent classification prompt."""
@@ -344,4 +420,42 @@ def get_human_handoff_prompt(lead_name: str, latest_message: str,
         lead_name=lead_name,
         latest_message=latest_message,
         conversation_history=conversation_history
-    )
\ No newline at end of file
+    )
+
+def get_lead_opportunity_analysis_prompt(lead_name: str, lead_status: str, risk_level: str,
+                                         initial_inquiry: str, days_since_creation: int,
+                                         sentiment_score: float, conversation_history: str,
+                                         relevant_offers: str) -> str:
+    """Get the formatted lead opportunity analysis prompt."""
+    return LEAD_OPPORTUNITY_ANALYSIS_PROMPT.format(
+        lead_name=lead_name,
+        lead_status=lead_status,
+        risk_level=risk_level,
+        initial_inquiry=initial_inquiry,
+        days_since_creation=days_since_creation,
+        sentiment_score=sentiment_score,
+        conversation_history=conversation_history,
+        relevant_offers=relevant_offers
+    )
+
+def get_proactive_engagement_prompt(lead_name: str, initial_interest: str, opportunity: str,
+                                    recommended_offer: str, urgency_level: str) -> str:
+    """Get the formatted proactive engagement message prompt."""
+    return PROACTIVE_ENGAGEMENT_PROMPT.format(
+        lead_name=lead_name,
+        initial_interest=initial_interest,
+        opportunity=opportunity,
+        recommended_offer=recommended_offer,
+        urgency_level=urgency_level
+    )
+
+def get_aggressive_retention_prompt(lead_name: str, risk_factors: str, sentiment_trend: str,
+                                    days_since_last_contact: str, relevant_offers: str) -> str:
+    """Get the formatted aggressive retention offer prompt."""
+    return AGGRESSIVE_RETENTION_PROMPT.format(
+        lead_name=lead_name,
+        risk_factors=risk_factors,
+        sentiment_trend=sentiment_trend,
+        days_since_last_contact=days_since_last_contact,
+        relevant_offers=relevant_offers
+    )
@@ -10,6 +10,13 @@ from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 # Initialize sentiment analyzer
 sentiment_analyzer = SentimentIntensityAnalyzer()
 
+# Display labels for message senders in formatted conversation history
+SENDER_LABELS = {
+    'lead': 'Patient',
+    'ai': 'AI Assistant',
+    'human': 'Staff Member'
+}
+
 
 def generate_secure_token(length: int = 32) -> str:
     """Generate a secure random token for URLs"""
@@ -37,6 +44,28 @@ def analyze_sentiment(text: str) -> float:
     return scores['compound']
 
 
+def analyze_sentiment_batch(texts: List[str]) -> List[float]:
+    """
+    Analyze sentiment for a list of texts in one pass.
+    Returns compound scores in the same order as the input texts.
+    """
+    polarity_scores = sentiment_analyzer.polarity_scores
+    return [polarity_scores(text)['compound'] for text in texts]
+
+
+def calculate_weighted_sentiment(sentiment_scores: List[float]) -> float:
+    """
+    Reduce a list of sentiment scores to a single linearly weighted mean.
+    The score at position i is weighted by i + 1.
+    """
+    if not sentiment_scores:
+        return 0.0
+    
+    count = len(sentiment_scores)
+    weighted_total = sum(score * weight for weight, score in enumerate(sentiment_scores, start=1))
+    return weighted_total / (count * (count + 1) / 2)
+
+
 def calculate_days_between(start_date: datetime, end_date: Optional[datetime] = None) -> int:
     """Calculate days between two dates"""
     if end_date is None:
@@ -64,18 +93,11 @@ def format_conversation_history(messages: List[Dict[str, Any]], limit: int = 10)
     sorted_messages = sorted(messages, key=lambda x: x['created_at'], reverse=True)[:limit]
     sorted_messages.reverse()  # Reverse back to chronological order
     
-    formatted_messages = []
-    for msg in sorted_messages:
-        sender_label = {
-            'lead': 'Patient',
-            'ai': 'AI Assistant',
-            'human': 'Staff Member'
-        }.get(msg['sender'], 'Unknown')
-        
-        timestamp = msg['created_at'].strftime("%Y-%m-%d %H:%M")
-        formatted_messages.append(f"[{timestamp}] {sender_label}: {msg['content']}")
-    
-    return "\n".join(formatted_messages)
+    return "\n".join(
+        f"[{msg['created_at'].strftime('%Y-%m-%d %H:%M')}] "
+        f"{SENDER_LABELS.get(msg['sender'], 'Unknown')}: {msg['content']}"
+        for msg in sorted_messages
+    )
 
 
 def extract_service_keywords(text: str) -> List[str]:
@@ -132,6 +154,7 @@ def determine_lead_risk_level(sentiment_score: float, response_gap_hours: int,
                             message_count: int) -> str:
     """
     Determine risk level based on conversation patterns.
+    Scored by determine_lead_risk_level_batch, which holds the thresholds.
     
     Args:
         sentiment_score: Current sentiment score (-1 to 1)
@@ -141,30 +164,38 @@ def determine_lead_risk_level(sentiment_score: float, response_gap_hours: int,
     Returns:
         Risk level: 'low', 'medium', or 'high'
     """
-    risk_factors = 0
-    
-    # Sentiment-based risk
-    if sentiment_score < -0.3:
-        risk_factors += 2
-    elif sentiment_score < 0:
-        risk_factors += 1
-    
-    # Response time-based risk
-    if response_gap_hours > 72:  # 3 days
-        risk_factors += 2
-    elif response_gap_hours > 24:  # 1 day
-        risk_factors += 1
-    
-    # Engagement-based risk
-    if message_count < 3:
-        risk_factors += 1
-    
-    if risk_factors >= 3:
-        return 'high'
-    elif risk_factors >= 2:
-        return 'medium'
-    else:
-        return 'low'
+    return determine_lead_risk_level_batch([sentiment_score], [response_gap_hours], [message_count])[0]
+
+
+# Risk level by total risk-factor score (0-5) as scored in determine_lead_risk_level_batch
+RISK_LEVELS_BY_SCORE = ('low', 'low', 'medium', 'high', 'high', 'high')
+
+
+def determine_lead_risk_level_batch(sentiment_scores: List[float], response_gap_hours: List[int],
+                                    message_counts: List[int]) -> List[str]:
+    """
+    Determine risk levels for a batch of leads in one pass over parallel lists of signals.
+    
+    Each lead scores risk factors for sentiment (2 below -0.3, 1 below 0), response
+    time (2 over 72 hours, 1 over 24 hours) and engagement (1 under 3 messages);
+    RISK_LEVELS_BY_SCORE maps the total to a level.
+    
+    Args:
+        sentiment_scores: Current sentiment score (-1 to 1) per lead
+        response_gap_hours: Hours since last response per lead
+        message_counts: Total number of messages in conversation per lead
+    
+    Returns:
+        Risk level per lead: 'low', 'medium', or 'high'
+    """
+    return [
+        RISK_LEVELS_BY_SCORE[
+            (2 if sentiment < -0.3 else 1 if sentiment < 0 else 0)
+            + (2 if gap > 72 else 1 if gap > 24 else 0)
+            + (1 if count < 3 else 0)
+        ]
+        for sentiment, gap, count in zip(sentiment_scores, response_gap_hours, message_counts)
+    ]
 
 
 def format_currency(amount: float) -> str:
@@ -8,7 +8,7 @@ from typing import List, Optional
 
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, Float, TIMESTAMP, 
-    ForeignKey, UniqueConstraint, Numeric
+    ForeignKey, UniqueConstraint, Numeric, Index
 )
 from sqlalchemy.dialects.postgresql import ENUM, JSONB
 from sqlalchemy.orm import relationship
@@ -52,6 +52,10 @@ class Lead(Base):
     Core lead entity - represents potential patients in the system
     """
     __tablename__ = "leads"
+    __table_args__ = (
+        # Serves the most recent high-risk leads in the risk summary (scanned backwards for DESC)
+        Index("ix_leads_status_risk_level_last_contact_at", "status", "risk_level", "last_contact_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -185,21 +189,34 @@ class FinancialExplainer(Base):
 
 class SystemEvent(Base):
     """
-    System-wide events and audit trail
+    System-wide events and audit trail.
+    Range-partitioned by week of created_at in PostgreSQL (primary key (id, created_at));
+    see SystemLogger.ensure_event_partitions.
     """
     __tablename__ = "system_events"
-
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        # Covers the windowed severity counts in the system health summary
+        Index("ix_system_events_created_at_severity", "created_at", "severity"),
+        # Keyset pagination of recent events, unfiltered and filtered by severity or type
+        Index("ix_system_events_created_at_id", "created_at", "id"),
+        Index("ix_system_events_severity_created_at_id", "severity", "created_at", "id"),
+        Index("ix_system_events_event_type_created_at_id", "event_type", "created_at", "id"),
+    )
+    # Fetch server-generated created_at in the INSERT's RETURNING clause instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE"), nullable=True, index=True)
     event_type = Column(String(100), nullable=False, index=True)
+    category = Column(String(16), nullable=True, index=True, comment="Event type prefix, e.g. 'ai' or 'error'")
     details = Column(Text, nullable=True)
     
     # Event metadata
     severity = Column(String(20), default="info", index=True)  # info, warning, error
     processed = Column(Boolean, default=False, index=True)
     
-    # Timestamps
-    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # Timestamps (the partition key, so part of the primary key)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True, primary_key=True)
     
     # Relationships
     lead = relationship("Lead", back_populates="system_events")
@@ -82,10 +82,23 @@ async def lifespan(app: FastAPI):
             max_instances=1
         )
         
+        # Schedule daily system_events partition maintenance (keeps the weekly partitions topped up)
+        scheduler.add_job(
+            func=run_event_partition_maintenance,
+            trigger=IntervalTrigger(hours=24),
+            id="event_partition_maintenance",
+            name="Create upcoming system event partitions",
+            replace_existing=True,
+            max_instances=1
+        )
+        
         # Start the scheduler
         scheduler.start()
         logger.info("✅ Background scheduler started successfully")
         
+        # Make sure the current week's event partition exists before logging
+        await run_event_partition_maintenance()
+        
         # Log system startup
         system_logger = SystemLogger(db)
         await system_logger.log_event(
@@ -380,6 +393,20 @@ async def run_daily_outreach_check():
         logger.error(f"❌ Daily outreach check failed: {e}")
 
 
+
+async def run_event_partition_maintenance():
+    """
+    Background job to create the upcoming weekly system_events partitions.
+    """
+    try:
+        db = next(get_db())
+        SystemLogger(db).ensure_event_partitions()
+        db.close()
+        
+    except Exception as e:
+        logger.error(f"❌ Event partition maintenance failed: {e}")
+
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -0,0 +1,17 @@
+"""
+Pydantic schemas for structured AI assessment outputs
+"""
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class OpportunityAssessment(BaseModel):
+    """Structured LLM output for lead opportunity analysis"""
+    should_engage: bool = Field(..., description="Whether the lead should be proactively engaged")
+    strategy: Literal["proactive_outreach", "escalate_to_human", "none"] = Field(
+        ..., description="Engagement strategy to apply"
+    )
+    reasoning: str = Field(..., description="Explanation of why this lead should or should not be engaged")
+    recommended_offer: Optional[str] = Field(None, description="Specific offer to present, if applicable")
+    urgency_level: Literal["low", "medium", "high"] = Field(..., description="Urgency of the engagement")
+    next_best_action: str = Field(..., description="Specific action to take")
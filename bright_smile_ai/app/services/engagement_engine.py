@@ -28,7 +28,7 @@ from app.core.prompts import (
 )
 from app.core.utils import analyze_sentiment, format_conversation_history, extract_service_keywords
 from app.services.asset_generator import AssetGenerator
-from app.services.system_logger import SystemLogger
+from app.services.system_logger import SystemLogger, LOG_BATCH_SIZE
 
 
 # State definition for LangGraph
@@ -107,7 +107,8 @@ class EngagementEngine:
     
     async def _get_lead_and_history(self, state: ConversationState) -> ConversationState:
         """Load lead data and conversation history"""
-        lead = self.db.query(Lead).filter(Lead.id == state["lead_id"]).first()
+        # Primary-key lookup: served from the session's identity map when the caller already loaded the lead
+        lead = self.db.get(Lead, state["lead_id"])
         if not lead:
             raise ValueError(f"Lead {state['lead_id']} not found")
         
@@ -380,48 +381,50 @@ class EngagementEngine:
             "ai_strategies_selected": 0
         }
         
-        for lead in cold_leads:
-            try:
-                # Run AI-powered qualification and strategy selection
-                qualification_result = await self._ai_qualify_and_strategize_lead(lead)
-                
-                if qualification_result["should_contact"]:
-                    # Execute the AI-selected strategy
-                    success = await self._execute_ai_outreach_strategy(lead, qualification_result)
-                    if success:
-                        stats["leads_contacted"] += 1
-                        stats["ai_strategies_selected"] += 1
-                        # Update lead status
-                        lead.status = LeadStatus.CONTACTED
+        # Buffer per-lead events for the run and write them in bulk at the end
+        with self.logger.buffered(LOG_BATCH_SIZE):
+            for lead in cold_leads:
+                try:
+                    # Run AI-powered qualification and strategy selection
+                    qualification_result = await self._ai_qualify_and_strategize_lead(lead)
+                    
+                    if qualification_result["should_contact"]:
+                        # Execute the AI-selected strategy
+                        success = await self._execute_ai_outreach_strategy(lead, qualification_result)
+                        if success:
+                            stats["leads_contacted"] += 1
+                            stats["ai_strategies_selected"] += 1
+                            # Update lead status
+                            lead.status = LeadStatus.CONTACTED
+                        else:
+                            stats["leads_skipped"] += 1
                     else:
                         stats["leads_skipped"] += 1
-                else:
-                    stats["leads_skipped"] += 1
-                    # Log why lead was skipped
-                    await self.logger.log_event(
-                        event_type="outreach_lead_skipped",
-                        details=f"Lead skipped: {qualification_result['reasoning']}",
-                        lead_id=lead.id,
-                        severity="info"
+                        # Log why lead was skipped
+                        await self.logger.log_event(
+                            event_type="outreach_lead_skipped",
+                            details=f"Lead skipped: {qualification_result['reasoning']}",
+                            lead_id=lead.id,
+                            severity="info"
+                        )
+                
+                except Exception as e:
+                    await self.logger.log_error(
+                        error_type="proactive_outreach",
+                        error_message=str(e),
+                        lead_id=lead.id
                     )
+                    stats["leads_skipped"] += 1
             
-            except Exception as e:
-                await self.logger.log_error(
-                    error_type="proactive_outreach",
-                    error_message=str(e),
-                    lead_id=lead.id
-                )
-                stats["leads_skipped"] += 1
-        
-        self.db.commit()
-        
-        # Log campaign results
-        await self.logger.log_outreach_campaign(
-            campaign_type="proactive_outreach",
-            leads_processed=stats["leads_processed"],
-            leads_contacted=stats["leads_contacted"],
-            leads_skipped=stats["leads_skipped"]
-        )
+            self.db.commit()
+            
+            # Log campaign results
+            await self.logger.log_outreach_campaign(
+                campaign_type="proactive_outreach",
+                leads_processed=stats["leads_processed"],
+                leads_contacted=stats["leads_contacted"],
+                leads_skipped=stats["leads_skipped"]
+            )
         
         return stats
     
@@ -643,16 +646,22 @@ Respond with ONLY valid JSON.
         lead: Lead, 
         risk_factors: str,
         recent_conversation: str,
-        sentiment_trend: List[float]
+        sentiment_trend: List[float],
+        commit: bool = True
     ) -> bool:
         """
         Send a predictive intervention message to an at-risk lead.
         
+        With commit=False the message is only flushed into the caller's open
+        transaction and errors are raised instead of logged, so a batch caller
+        (RiskAnalyzer's scans) keeps one transaction and logs through its own logger.
+        
         Args:
             lead: The at-risk lead
             risk_factors: Identified risk factors
             recent_conversation: Recent conversation context
             sentiment_trend: Recent sentiment scores
+            commit: Commit the message and log errors here (the default)
             
         Returns:
             True if intervention was sent successfully
@@ -668,20 +677,27 @@ Respond with ONLY valid JSON.
             response = await self.llm.ainvoke([SystemMessage(content=prompt)])
             
             # Save intervention message
+            sent_at = datetime.now(timezone.utc)
             message = Message(
                 lead_id=lead.id,
                 sender=SenderType.AI,
                 content=response.content,
-                intent_classification="predictive_intervention"
+                intent_classification="predictive_intervention",
+                created_at=sent_at
             )
             
             self.db.add(message)
-            lead.last_contact_at = datetime.now(timezone.utc)
-            self.db.commit()
+            lead.last_contact_at = sent_at
+            if commit:
+                self.db.commit()
+            else:
+                self.db.flush()
             
             return True
         
         except Exception as e:
+            if not commit:
+                raise
             await self.logger.log_error(
                 error_type="predictive_intervention",
                 error_message=str(e),
@@ -1,23 +1,68 @@
 """
 RiskAnalyzer Service - Analyzes lead risk patterns and triggers interventions
 """
+import asyncio
+import re
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import and_, func, insert, select
 
 from langchain_core.messages import SystemMessage
 from langchain_openai import ChatOpenAI
 
 from app.db.models import Lead, Message, LeadStatus, LeadRiskLevel, SenderType, Offer
+from app.schemas.ai_assessment import OpportunityAssessment
 from app.core.config import settings
+from app.core.prompts import (
+    get_lead_opportunity_analysis_prompt,
+    get_proactive_engagement_prompt,
+    get_aggressive_retention_prompt
+)
 from app.core.utils import (
-    analyze_sentiment, 
+    analyze_sentiment_batch,
+    calculate_weighted_sentiment,
     determine_lead_risk_level,
+    determine_lead_risk_level_batch,
     format_conversation_history,
-    extract_service_keywords
+    extract_service_keywords,
+    truncate_text
+)
+from app.services.system_logger import SystemLogger, LOG_BATCH_SIZE
+
+
+# Keyword groups scanned in a lead's latest messages to flag risk factors
+RISK_KEYWORDS = {
+    "price": ["expensive", "cost", "price", "afford", "budget", "money", "insurance"],
+    "anxiety": ["nervous", "scared", "worried", "anxious", "pain", "hurt"],
+    "competitor": ["other dentist", "another practice", "comparing", "quote"],
+}
+
+# Single alternation with one named group per category so all keyword
+# groups are detected in one pass over the text
+RISK_KEYWORD_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{category}>{'|'.join(re.escape(keyword) for keyword in keywords)})"
+        for category, keywords in RISK_KEYWORDS.items()
+    ),
+    re.IGNORECASE
 )
-from app.services.system_logger import SystemLogger
+
+# Number of latest messages considered when assessing a lead's risk
+RISK_RECENT_MESSAGE_LIMIT = 10
+
+# Prompt size budgets for the per-lead LLM calls
+PROMPT_MAX_OFFERS = 5
+PROMPT_MAX_INQUIRY_CHARS = 300
+PROMPT_MAX_CONVERSATION_CHARS = 1500
+
+# Opportunity assessments are shared between leads with the same coarse profile
+OPPORTUNITY_CACHE_TTL_SECONDS = 3600
+OPPORTUNITY_CACHE_MAX_ENTRIES = 10_000
+
+# Zeroed risk distribution template; copied per get_risk_summary call
+EMPTY_RISK_SUMMARY = {level.value: 0 for level in LeadRiskLevel}
 
 
 class RiskAnalyzer:
@@ -27,10 +72,17 @@ class RiskAnalyzer:
     Now enhanced with AI-powered lead scanning and aggressive offer generation.
     """
     
+    # Process-wide cache of AI opportunity assessments: key -> (expires_at, assessment)
+    _opportunity_cache: Dict[tuple, tuple] = {}
+    
     def __init__(self, db: Session, engagement_engine=None):
         self.db = db
         self.engagement_engine = engagement_engine  # Injected to avoid circular import
-        self.logger = SystemLogger(db)
+        # Events join each scan's transaction and are committed with its final commit
+        self.logger = SystemLogger(db, batch_size=LOG_BATCH_SIZE, autocommit=False)
+        
+        # Outbound AI messages queued during a scan and inserted in one batch
+        self.pending_messages: List[Dict[str, Any]] = []
         
         # Initialize OpenAI client for AI-powered analysis
         self.llm = ChatOpenAI(
@@ -38,6 +90,16 @@ class RiskAnalyzer:
             model=settings.openai_model,
             temperature=0.3  # Lower temperature for more consistent analysis
         )
+        
+        # Smaller, deterministic model for the short opportunity classification step
+        self.classifier_llm = ChatOpenAI(
+            api_key=settings.openai_api_key,
+            model=settings.openai_classifier_model,
+            temperature=0.0
+        )
+        
+        # Schema-constrained client so opportunity analysis never needs free-text JSON parsing
+        self.opportunity_llm = self.classifier_llm.with_structured_output(OpportunityAssessment)
     
     def _get_timezone_aware_now(self):
         """Get timezone-aware current datetime"""
@@ -56,6 +118,143 @@ class RiskAnalyzer:
         
         return (dt1 - dt2).total_seconds()
     
+    def _queue_outbound_message(self, lead: Lead, content: str, intent_classification: str) -> None:
+        """
+        Queue an AI message for the lead to be written by _flush_pending_messages.
+        Stamped with the time it was queued, so conversation order does not depend
+        on when the batch is flushed.
+        """
+        self.pending_messages.append({
+            "lead_id": lead.id,
+            "sender": SenderType.AI,
+            "content": content,
+            "intent_classification": intent_classification,
+            "created_at": self._get_timezone_aware_now()
+        })
+    
+    def _flush_pending_messages(self) -> int:
+        """
+        Insert all queued outbound messages with a single executemany INSERT.
+        
+        Returns:
+            Number of messages written
+        """
+        if not self.pending_messages:
+            return 0
+        
+        rows = self.pending_messages
+        self.pending_messages = []
+        self.db.execute(insert(Message), rows)
+        return len(rows)
+    
+    async def _run_lead_tasks(
+        self,
+        leads: List[Lead],
+        handler: Callable[[Lead], Awaitable[None]],
+        error_type: str,
+        error_context: str
+    ) -> None:
+        """
+        Run a per-lead coroutine for every lead, one lead at a time.
+        The handlers mutate the analyzer's shared session (and an injected engagement
+        engine may write through it too), so units of work are never interleaved;
+        LLM generation is overlapped beforehand with _generate_lead_messages instead.
+        A failing lead is logged and never stops the rest of the batch.
+        
+        Args:
+            leads: Leads to process
+            handler: Coroutine function processing a single lead
+            error_type: Error type logged for leads whose handler raised
+            error_context: Additional context logged with each failure
+        """
+        for lead in leads:
+            try:
+                await handler(lead)
+            except Exception as e:
+                await self.logger.log_error(
+                    error_type=error_type,
+                    error_message=str(e),
+                    lead_id=lead.id,
+                    additional_context=error_context
+                )
+    
+    async def _generate_lead_messages(
+        self,
+        leads: List[Lead],
+        build_prompt: Callable[[Lead], str],
+        error_type: str,
+        error_context: str
+    ) -> Dict[int, str]:
+        """
+        Generate one outbound message per lead with the LLM calls running concurrently.
+        Prompts are built first, one lead at a time, and nothing touches the session
+        while generations are in flight. At most settings.lead_scan_concurrency
+        requests run at once.
+        Failures are returned by gather rather than raised, and each one is logged
+        against its lead here; those leads are left out of the result.
+        
+        Args:
+            leads: Leads to generate a message for
+            build_prompt: Builds the formatted prompt for a single lead
+            error_type: Error type logged for leads whose message could not be generated
+            error_context: Additional context logged with each failure
+            
+        Returns:
+            Mapping of lead ID to generated content for every lead that succeeded
+        """
+        prompts = {}
+        failures = {}
+        for lead in leads:
+            try:
+                prompts[lead.id] = build_prompt(lead)
+            except Exception as e:
+                failures[lead.id] = e
+        
+        semaphore = asyncio.Semaphore(settings.lead_scan_concurrency)
+        
+        async def generate(prompt: str) -> str:
+            async with semaphore:
+                return await self._generate_message_content(prompt)
+        
+        contents = await asyncio.gather(*(generate(prompt) for prompt in prompts.values()), return_exceptions=True)
+        
+        messages = {}
+        for lead_id, content in zip(prompts, contents):
+            if isinstance(content, Exception):
+                failures[lead_id] = content
+            else:
+                messages[lead_id] = content
+        
+        for lead_id, error in failures.items():
+            await self.logger.log_error(
+                error_type=error_type,
+                error_message=str(error),
+                lead_id=lead_id,
+                additional_context=error_context
+            )
+        
+        return messages
+    
+    async def stream_message_chunks(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Stream an outbound message from the LLM chunk by chunk.
+        Lets request-scoped callers forward tokens as soon as they arrive.
+        
+        Args:
+            prompt: Fully formatted system prompt
+            
+        Yields:
+            Text chunks in generation order
+        """
+        async for chunk in self.llm.astream([SystemMessage(content=prompt)]):
+            if chunk.content:
+                yield chunk.content
+    
+    async def _generate_message_content(self, prompt: str) -> str:
+        """Generate an outbound message by accumulating streamed chunks"""
+        chunks = [chunk async for chunk in self.stream_message_chunks(prompt)]
+        return "".join(chunks)
+    
     async def scan_all_leads_for_opportunities(self) -> Dict[str, int]:
         """
         AI-powered lead scanning to identify opportunities for proactive engagement.
@@ -77,42 +276,42 @@ class RiskAnalyzer:
             "leads_escalated": 0
         }
         
-        for lead in scan_candidates:
-            try:
-                # AI-powered opportunity analysis
-                opportunity_assessment = await self._ai_analyze_lead_opportunity(lead)
-                
-                if opportunity_assessment["should_engage"]:
-                    stats["opportunities_identified"] += 1
-                    
-                    # Determine engagement strategy
-                    if opportunity_assessment["strategy"] == "proactive_outreach":
-                        success = await self._send_proactive_engagement(lead, opportunity_assessment)
-                        if success:
-                            stats["proactive_messages_sent"] += 1
-                    
-                    elif opportunity_assessment["strategy"] == "escalate_to_human":
-                        lead.status = LeadStatus.HUMAN_HANDOFF
-                        lead.reason_for_cold = "AI identified high-value opportunity requiring human attention"
-                        stats["leads_escalated"] += 1
-                        
-                        await self.logger.log_event(
-                            event_type="ai_escalation",
-                            details=f"AI escalated lead due to: {opportunity_assessment['reasoning']}",
-                            lead_id=lead.id,
-                            severity="info"
-                        )
-                
-            except Exception as e:
+        # Analyze every candidate first so all LLM classifications go out as one batch
+        assessments = await self._ai_analyze_lead_opportunities(scan_candidates)
+        assessments_by_lead = {}
+        for lead, assessment in zip(scan_candidates, assessments):
+            if isinstance(assessment, Exception):
                 await self.logger.log_error(
                     error_type="opportunity_scanning",
-                    error_message=str(e),
+                    error_message=str(assessment),
                     lead_id=lead.id,
                     additional_context="Error during AI opportunity analysis"
                 )
+            else:
+                assessments_by_lead[lead.id] = assessment
         
-        # Commit all changes
-        self.db.commit()
+        assessed_leads = [lead for lead in scan_candidates if lead.id in assessments_by_lead]
+        
+        # Generate every proactive message concurrently, then act on the leads one at a time
+        proactive_messages = await self._generate_lead_messages(
+            [
+                lead for lead in assessed_leads
+                if assessments_by_lead[lead.id]["should_engage"]
+                and assessments_by_lead[lead.id]["strategy"] == "proactive_outreach"
+            ],
+            lambda lead: self._proactive_engagement_prompt(lead, assessments_by_lead[lead.id]),
+            error_type="proactive_engagement",
+            error_context="Error sending proactive engagement message"
+        )
+        
+        await self._run_lead_tasks(
+            assessed_leads,
+            lambda lead: self._act_on_opportunity(
+                lead, assessments_by_lead[lead.id], stats, proactive_messages.get(lead.id)
+            ),
+            error_type="opportunity_scanning",
+            error_context="Error during AI opportunity analysis"
+        )
         
         # Log scanning completion
         await self.logger.log_event(
@@ -121,8 +320,42 @@ class RiskAnalyzer:
             severity="info"
         )
         
+        # Write queued outbound messages and events, then commit all changes
+        self._flush_pending_messages()
+        self.logger.flush()
+        self.db.commit()
+        
         return stats
     
+    async def _act_on_opportunity(self, lead: Lead, opportunity_assessment: Dict[str, Any],
+                                  stats: Dict[str, int], message_content: Optional[str] = None) -> None:
+        """
+        Engage or escalate one scan candidate based on its assessment, updating stats in place.
+        message_content is the pre-generated proactive message; None when its generation
+        failed (already logged by _generate_lead_messages).
+        """
+        if opportunity_assessment["should_engage"]:
+            stats["opportunities_identified"] += 1
+            
+            # Determine engagement strategy
+            if opportunity_assessment["strategy"] == "proactive_outreach":
+                if message_content is not None:
+                    success = await self._send_proactive_engagement(lead, opportunity_assessment, message_content)
+                    if success:
+                        stats["proactive_messages_sent"] += 1
+            
+            elif opportunity_assessment["strategy"] == "escalate_to_human":
+                lead.status = LeadStatus.HUMAN_HANDOFF
+                lead.reason_for_cold = "AI identified high-value opportunity requiring human attention"
+                stats["leads_escalated"] += 1
+                
+                await self.logger.log_event(
+                    event_type="ai_escalation",
+                    details=f"AI escalated lead due to: {opportunity_assessment['reasoning']}",
+                    lead_id=lead.id,
+                    severity="info"
+                )
+    
     async def _ai_analyze_lead_opportunity(self, lead: Lead) -> Dict[str, Any]:
         """
         Use AI to analyze if a lead presents an opportunity for proactive engagement.
@@ -133,11 +366,66 @@ class RiskAnalyzer:
         Returns:
             Dictionary containing opportunity assessment
         """
-        # Get recent conversation context
-        recent_messages = self.db.query(Message).filter(
-            Message.lead_id == lead.id
-        ).order_by(Message.created_at.desc()).limit(8).all()
+        assessment = (await self._ai_analyze_lead_opportunities([lead]))[0]
+        if isinstance(assessment, Exception):
+            raise assessment
+        return assessment
+    
+    async def _ai_analyze_lead_opportunities(self, leads: List[Lead]) -> List[Any]:
+        """
+        Analyze a batch of leads for proactive engagement opportunities.
+        Leads decided by the rules or the cache skip the LLM; the rest are sent
+        through one abatch call, with one request per distinct cache key.
         
+        Args:
+            leads: The leads to analyze
+            
+        Returns:
+            One opportunity assessment per lead, in input order. A lead whose
+            context could not be loaded gets the raised exception instead.
+        """
+        plans = []
+        for lead in leads:
+            try:
+                plans.append(self._prepare_opportunity_analysis(lead))
+            except Exception as e:
+                plans.append({"assessment": e})
+        
+        # Leads with the same cache key share a single LLM request
+        pending = [plan for plan in plans if plan["assessment"] is None]
+        requests_by_key = {}
+        for plan in pending:
+            requests_by_key.setdefault(plan["cache_key"], plan)
+        
+        if requests_by_key:
+            responses = await self.opportunity_llm.abatch(
+                [[SystemMessage(content=plan["prompt"])] for plan in requests_by_key.values()],
+                config={"max_concurrency": settings.lead_scan_concurrency},
+                return_exceptions=True
+            )
+            
+            analyses_by_key = {}
+            for cache_key, response in zip(requests_by_key, responses):
+                if not isinstance(response, Exception):
+                    analyses_by_key[cache_key] = response.model_dump()
+                    self._cache_opportunity(cache_key, analyses_by_key[cache_key])
+            
+            for plan in pending:
+                analysis = analyses_by_key.get(plan["cache_key"])
+                # Fall back to the rule-based analysis if AI fails
+                plan["assessment"] = dict(analysis) if analysis is not None else plan["fallback"]
+        
+        return [plan["assessment"] for plan in plans]
+    
+    def _prepare_opportunity_analysis(self, lead: Lead) -> Dict[str, Any]:
+        """
+        Gather the context for one lead's opportunity analysis.
+        
+        Returns:
+            Dictionary whose "assessment" is set when the rules or the cache already
+            decide the lead; otherwise it carries the LLM "prompt", its "cache_key"
+            and the rule-based "fallback"
+        """
         # Get lead's service interests
         service_keywords = extract_service_keywords(lead.initial_inquiry or "")
         
@@ -157,10 +445,35 @@ class RiskAnalyzer:
                 Offer.is_active == True
             ).limit(3).all()
         
-        offers_text = "\n".join([
-            f"- {offer.offer_title}: {offer.description}"
-            for offer in relevant_offers
-        ]) if relevant_offers else "No current offers available."
+        days_since_creation = (
+            (self._get_timezone_aware_now() - lead.created_at.replace(tzinfo=None)).days
+            if lead.created_at
+            else 0
+        )
+        
+        # Leads the rules can decide with high confidence never reach the LLM
+        rule_assessment = self._fallback_opportunity_analysis(lead, [], relevant_offers)
+        if rule_assessment["should_engage"] and rule_assessment["confidence"] == "high":
+            return {"assessment": rule_assessment}
+        
+        # Reuse a recent assessment for leads with the same profile
+        cache_key = self._opportunity_cache_key(
+            lead, days_since_creation, service_keywords, relevant_offers
+        )
+        cached_assessment = self._get_cached_opportunity(cache_key)
+        if cached_assessment is not None:
+            return {"assessment": cached_assessment}
+        
+        # Get recent conversation context
+        recent_messages = self.db.query(Message).filter(
+            Message.lead_id == lead.id
+        ).order_by(Message.created_at.desc()).limit(5).all()
+        
+        # Titles are enough for the engage/no-engage decision
+        offers_text = "; ".join(
+            f"{offer.id}:{offer.offer_title}"
+            for offer in self._unique_offers(relevant_offers)
+        ) if relevant_offers else "No current offers available."
         
         # Format conversation for AI analysis
         conversation_text = ""
@@ -172,63 +485,80 @@ class RiskAnalyzer:
                     "content": msg.content,
                     "created_at": msg.created_at
                 })
-            conversation_text = format_conversation_history(messages_data, limit=5)
+            conversation_text = truncate_text(
+                format_conversation_history(messages_data, limit=5),
+                max_length=PROMPT_MAX_CONVERSATION_CHARS
+            )
         
         # AI prompt for opportunity analysis
-        analysis_prompt = f"""
-You are an AI lead analysis expert for a dental practice. Analyze this lead to determine if there's an opportunity for proactive engagement.
-
-LEAD INFORMATION:
-- Name: {lead.name}
-- Status: {lead.status.value}
-- Risk Level: {lead.risk_level.value}
-- Initial Inquiry: {lead.initial_inquiry or "Not specified"}
-- Days Since Creation: {(self._get_timezone_aware_now() - lead.created_at.replace(tzinfo=None)).days if lead.created_at else 0}
-- Sentiment Score: {lead.sentiment_score or 0.0}
-
-RECENT CONVERSATION:
-{conversation_text if conversation_text else "No recent conversation"}
-
-AVAILABLE OFFERS:
-{offers_text}
-
-ANALYSIS TASK:
-Determine if this lead presents an opportunity for proactive engagement. Consider:
-1. Are they showing buying signals?
-2. Could they benefit from a specific offer?
-3. Are they at risk of going cold?
-4. Would proactive outreach add value?
-
-RESPONSE FORMAT (JSON):
-{{
-    "should_engage": true/false,
-    "strategy": "proactive_outreach" or "escalate_to_human" or "none",
-    "reasoning": "Detailed explanation of why this lead should be engaged",
-    "recommended_offer": "Specific offer to present, if applicable",
-    "urgency_level": "low", "medium", or "high",
-    "next_best_action": "Specific action to take"
-}}
-
-Respond with ONLY valid JSON.
-"""
+        analysis_prompt = get_lead_opportunity_analysis_prompt(
+            lead_name=lead.name,
+            lead_status=lead.status.value,
+            risk_level=lead.risk_level.value,
+            initial_inquiry=truncate_text(lead.initial_inquiry, PROMPT_MAX_INQUIRY_CHARS) if lead.initial_inquiry else "Not specified",
+            days_since_creation=days_since_creation,
+            sentiment_score=lead.sentiment_score or 0.0,
+            conversation_history=conversation_text if conversation_text else "No recent conversation",
+            relevant_offers=offers_text
+        )
         
-        try:
-            # Get AI analysis
-            response = await self.llm.ainvoke([SystemMessage(content=analysis_prompt)])
-            
-            # Parse AI response
-            import json
-            analysis = json.loads(response.content.strip())
-            
-            return analysis
-            
-        except Exception as e:
-            # Fallback to rule-based analysis if AI fails
-            return self._fallback_opportunity_analysis(lead, recent_messages, relevant_offers)
+        return {
+            "assessment": None,
+            "prompt": analysis_prompt,
+            "cache_key": cache_key,
+            "fallback": rule_assessment
+        }
+    
+    def _unique_offers(self, offers: List[Offer]) -> List[Offer]:
+        """De-duplicate offers matched by several keywords and cap them to the prompt budget"""
+        unique_offers = {offer.id: offer for offer in offers}
+        return list(unique_offers.values())[:PROMPT_MAX_OFFERS]
+    
+    def _opportunity_cache_key(self, lead: Lead, days_since_creation: int,
+                               service_keywords: List[str], relevant_offers: List[Offer]) -> tuple:
+        """Build a bucketed cache key from the lead features that drive opportunity analysis"""
+        return (
+            lead.status.value,
+            lead.risk_level.value,
+            round((lead.sentiment_score or 0.0) * 4) / 4,  # 0.25-wide sentiment buckets
+            min(days_since_creation, 30),
+            tuple(sorted(service_keywords)),
+            tuple(sorted(offer.id for offer in relevant_offers))
+        )
+    
+    def _get_cached_opportunity(self, cache_key: tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached assessment, or None if missing or expired"""
+        entry = self._opportunity_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        expires_at, analysis = entry
+        if expires_at <= time.monotonic():
+            self._opportunity_cache.pop(cache_key, None)
+            return None
+        
+        return dict(analysis)
+    
+    def _cache_opportunity(self, cache_key: tuple, analysis: Dict[str, Any]) -> None:
+        """Store an assessment, evicting expired and then oldest entries when full"""
+        cache = self._opportunity_cache
+        now = time.monotonic()
+        
+        if len(cache) >= OPPORTUNITY_CACHE_MAX_ENTRIES:
+            for key in [key for key, (expires_at, _) in cache.items() if expires_at <= now]:
+                del cache[key]
+        if len(cache) >= OPPORTUNITY_CACHE_MAX_ENTRIES:
+            del cache[next(iter(cache))]
+        
+        cache[cache_key] = (now + OPPORTUNITY_CACHE_TTL_SECONDS, dict(analysis))
     
     def _fallback_opportunity_analysis(self, lead: Lead, recent_messages: List[Message], 
                                      relevant_offers: List[Offer]) -> Dict[str, Any]:
-        """Fallback rule-based analysis if AI analysis fails"""
+        """
+        Rule-based opportunity analysis.
+        Used as a pre-filter for clear-cut leads and as the fallback if AI analysis fails.
+        Each result carries a "confidence" of "high" or "low" for the rule that fired.
+        """
         
         # Simple rule-based logic
         days_since_creation = (self._get_timezone_aware_now() - lead.created_at.replace(tzinfo=None)).days if lead.created_at else 0
@@ -242,7 +572,8 @@ Respond with ONLY valid JSON.
                 "reasoning": "New lead hasn't been engaged yet",
                 "recommended_offer": relevant_offers[0].offer_title if has_offers else "Welcome consultation",
                 "urgency_level": "medium",
-                "next_best_action": "Send welcome message with relevant offer"
+                "next_best_action": "Send welcome message with relevant offer",
+                "confidence": "high"
             }
         
         elif lead.status == LeadStatus.AT_RISK and lead.risk_level == LeadRiskLevel.HIGH:
@@ -252,7 +583,8 @@ Respond with ONLY valid JSON.
                 "reasoning": "High-risk lead needs immediate attention",
                 "recommended_offer": "Special consultation discount" if has_offers else "Urgent follow-up",
                 "urgency_level": "high",
-                "next_best_action": "Send aggressive retention offer"
+                "next_best_action": "Send aggressive retention offer",
+                "confidence": "high"
             }
         
         elif lead.status == LeadStatus.AT_RISK and lead.risk_level == LeadRiskLevel.MEDIUM:
@@ -262,7 +594,8 @@ Respond with ONLY valid JSON.
                 "reasoning": "Medium-risk lead needs attention",
                 "recommended_offer": "Follow-up consultation" if has_offers else "Check-in message",
                 "urgency_level": "medium",
-                "next_best_action": "Send supportive follow-up message"
+                "next_best_action": "Send supportive follow-up message",
+                "confidence": "low"
             }
         
         elif lead.status == LeadStatus.ACTIVE and days_since_creation > 3:
@@ -272,7 +605,8 @@ Respond with ONLY valid JSON.
                 "reasoning": "Active lead may need follow-up",
                 "recommended_offer": "Progress check-in" if has_offers else "General follow-up",
                 "urgency_level": "low",
-                "next_best_action": "Send friendly check-in message"
+                "next_best_action": "Send friendly check-in message",
+                "confidence": "low"
             }
         
         return {
@@ -281,53 +615,42 @@ Respond with ONLY valid JSON.
             "reasoning": "No immediate opportunity identified",
             "recommended_offer": None,
             "urgency_level": "low",
-            "next_best_action": "Continue monitoring"
+            "next_best_action": "Continue monitoring",
+            "confidence": "low"
         }
     
-    async def _send_proactive_engagement(self, lead: Lead, assessment: Dict[str, Any]) -> bool:
+    def _proactive_engagement_prompt(self, lead: Lead, assessment: Dict[str, Any]) -> str:
+        """Build the proactive engagement prompt for a lead from its AI assessment"""
+        return get_proactive_engagement_prompt(
+            lead_name=lead.name,
+            initial_interest=lead.initial_inquiry or "dental services",
+            opportunity=assessment['reasoning'],
+            recommended_offer=assessment.get('recommended_offer', 'None'),
+            urgency_level=assessment['urgency_level']
+        )
+    
+    async def _send_proactive_engagement(self, lead: Lead, assessment: Dict[str, Any],
+                                         message_content: Optional[str] = None) -> bool:
         """
         Send proactive engagement message based on AI assessment.
         
         Args:
             lead: The lead to engage
             assessment: AI opportunity assessment
+            message_content: Pre-generated message; generated here when None
             
         Returns:
             True if message was sent successfully
         """
         try:
-            # Generate personalized message using AI
-            message_prompt = f"""
-You are a dental practice AI assistant. Create a proactive engagement message for this lead.
-
-LEAD CONTEXT:
-- Name: {lead.name}
-- Initial Interest: {lead.initial_inquiry or "dental services"}
-- Opportunity: {assessment['reasoning']}
-- Recommended Offer: {assessment.get('recommended_offer', 'None')}
-- Urgency: {assessment['urgency_level']}
-
-MESSAGE REQUIREMENTS:
-- Be warm and helpful, not pushy
-- Reference their specific interest
-- Include the recommended offer if applicable
-- Make it easy for them to respond
-- Keep it under 150 words
-
-Create a natural, engaging message that feels like a helpful follow-up from a caring dental practice.
-"""
-            
-            response = await self.llm.ainvoke([SystemMessage(content=message_prompt)])
-            
-            # Save the proactive message
-            message = Message(
-                lead_id=lead.id,
-                sender=SenderType.AI,
-                content=response.content,
-                intent_classification="proactive_engagement"
-            )
+            # Generate personalized message using AI unless it was generated with the batch
+            if message_content is None:
+                message_content = await self._generate_message_content(
+                    self._proactive_engagement_prompt(lead, assessment)
+                )
             
-            self.db.add(message)
+            # Queue the proactive message for the end-of-scan batch insert
+            self._queue_outbound_message(lead, message_content, "proactive_engagement")
             lead.last_contact_at = self._get_timezone_aware_now()
             
             # Log the proactive engagement
@@ -358,11 +681,24 @@ Create a natural, engaging message that feels like a helpful follow-up from a ca
             Dictionary with analysis statistics
         """
         # Get all leads that are currently active or at-risk
-        active_leads = self.db.query(Lead).filter(
+        # Total message count is fetched alongside each lead as a correlated subquery
+        message_count_subquery = select(func.count(Message.id)).where(
+            Message.lead_id == Lead.id
+        ).correlate(Lead).scalar_subquery()
+        
+        lead_rows = self.db.query(Lead, message_count_subquery.label("message_count")).filter(
             Lead.status.in_([LeadStatus.ACTIVE, LeadStatus.AT_RISK]),
             Lead.do_not_contact == False
         ).all()
         
+        active_leads = [lead for lead, _ in lead_rows]
+        message_counts = {lead.id: message_count for lead, message_count in lead_rows}
+        
+        # Latest messages for every candidate in one windowed query
+        recent_messages_by_lead = self._get_recent_messages_by_lead(
+            [lead.id for lead in active_leads], RISK_RECENT_MESSAGE_LIMIT
+        )
+        
         stats = {
             "total_analyzed": len(active_leads),
             "newly_at_risk": 0,
@@ -371,86 +707,54 @@ Create a natural, engaging message that feels like a helpful follow-up from a ca
             "aggressive_offers_sent": 0
         }
         
-        for lead in active_leads:
-            try:
-                risk_assessment = await self.assess_lead_risk(lead)
-                
-                # Update lead risk level if changed
-                if risk_assessment["risk_level"] != lead.risk_level.value:
-                    old_risk = lead.risk_level.value
-                    new_risk = LeadRiskLevel(risk_assessment["risk_level"])
-                    
-                    lead.risk_level = new_risk
-                    lead.sentiment_score = risk_assessment["sentiment_score"]
-                    
-                    # Log the risk level change
-                    await self.logger.log_event(
-                        event_type="risk_level_change",
-                        details=f"Risk level changed from {old_risk} to {new_risk.value}",
-                        lead_id=lead.id,
-                        severity="warning" if new_risk == LeadRiskLevel.HIGH else "info"
-                    )
-                    
-                    if new_risk == LeadRiskLevel.HIGH:
-                        stats["newly_at_risk"] += 1
-                        
-                        # Update status to at-risk if not already
-                        if lead.status != LeadStatus.AT_RISK:
-                            lead.status = LeadStatus.AT_RISK
-                
-                # Send aggressive offer for high-risk leads (both newly at risk and existing high-risk)
-                if lead.risk_level == LeadRiskLevel.HIGH:
-                    # Only count as newly at risk if the status just changed
-                    if risk_assessment["risk_level"] != lead.risk_level.value:
-                        stats["newly_at_risk"] += 1
-                    
-                    # Update status to at-risk if not already
-                    if lead.status != LeadStatus.AT_RISK:
-                        lead.status = LeadStatus.AT_RISK
-                    
-                    # Send aggressive offer for high-risk leads
-                    aggressive_offer_sent = await self._send_aggressive_retention_offer(lead, risk_assessment)
-                    if aggressive_offer_sent:
-                        stats["aggressive_offers_sent"] += 1
-                    
-                    # Trigger intervention if engagement engine is available
-                    if self.engagement_engine:
-                        intervention_sent = await self._trigger_predictive_intervention(
-                            lead, risk_assessment
-                        )
-                        if intervention_sent:
-                            stats["interventions_triggered"] += 1
-                
-                # Also trigger for leads that are at-risk with medium risk level
-                elif lead.status == LeadStatus.AT_RISK and lead.risk_level == LeadRiskLevel.MEDIUM:
-                    # Send intervention for medium-risk at-risk leads
-                    if self.engagement_engine:
-                        intervention_sent = await self._trigger_predictive_intervention(
-                            lead, risk_assessment
-                        )
-                        if intervention_sent:
-                            stats["interventions_triggered"] += 1
-                
-                # Check if lead should be moved to cold status
-                if await self._should_move_to_cold(lead, risk_assessment):
-                    lead.status = LeadStatus.COLD
-                    lead.reason_for_cold = "Automated: No response after risk intervention"
-                    stats["moved_to_cold"] += 1
-                    
-                    await self.logger.log_lead_status_change(
-                        lead, "at_risk", "cold", "Automated: No response after intervention"
-                    )
-            
-            except Exception as e:
-                await self.logger.log_error(
-                    error_type="risk_analysis",
-                    error_message=str(e),
-                    lead_id=lead.id,
-                    additional_context="Error during lead risk analysis"
-                )
+        # Gather signals per lead, then classify every scorable lead in one batch
+        risk_assessments = {
+            lead.id: self._collect_risk_signals(
+                lead,
+                message_count=message_counts.get(lead.id, 0),
+                recent_messages=recent_messages_by_lead.get(lead.id, [])
+            )
+            for lead in active_leads
+        }
+        unscored = [
+            assessment for assessment in risk_assessments.values()
+            if "risk_level" not in assessment
+        ]
+        risk_levels = determine_lead_risk_level_batch(
+            [assessment["sentiment_score"] for assessment in unscored],
+            [int(assessment["last_response_hours"]) for assessment in unscored],
+            [assessment["total_messages"] for assessment in unscored]
+        )
+        for assessment, risk_level in zip(unscored, risk_levels):
+            assessment["risk_level"] = risk_level
         
-        # Commit all changes
-        self.db.commit()
+        await self._run_lead_tasks(
+            active_leads,
+            lambda lead: self._update_lead_risk_level(lead, stats, risk_assessments[lead.id]),
+            error_type="risk_analysis",
+            error_context="Error during lead risk analysis"
+        )
+        
+        # Generate every retention offer concurrently, then act on the leads one at a time
+        retention_messages = await self._generate_lead_messages(
+            [lead for lead in active_leads if lead.risk_level == LeadRiskLevel.HIGH],
+            lambda lead: self._aggressive_retention_prompt(lead, risk_assessments[lead.id]),
+            error_type="aggressive_retention",
+            error_context="Error sending aggressive retention offer"
+        )
+        
+        await self._run_lead_tasks(
+            active_leads,
+            lambda lead: self._act_on_lead_risk(
+                lead,
+                stats,
+                risk_assessments[lead.id],
+                recent_messages_by_lead.get(lead.id, []),
+                retention_messages.get(lead.id)
+            ),
+            error_type="risk_analysis",
+            error_context="Error during lead risk analysis"
+        )
         
         # Log campaign completion
         await self.logger.log_outreach_campaign(
@@ -459,10 +763,121 @@ Create a natural, engaging message that feels like a helpful follow-up from a ca
             leads_contacted=stats["interventions_triggered"] + stats["aggressive_offers_sent"],
             leads_skipped=stats["total_analyzed"] - stats["interventions_triggered"] - stats["aggressive_offers_sent"]
         )
+        await self.logger.drain()
+        
+        # Write queued outbound messages and events, then commit all changes
+        self._flush_pending_messages()
+        self.logger.flush()
+        self.db.commit()
         
         return stats
 
-    async def _send_aggressive_retention_offer(self, lead: Lead, risk_assessment: Dict[str, Any]) -> bool:
+    async def _update_lead_risk_level(self, lead: Lead, stats: Dict[str, int],
+                                      risk_assessment: Dict[str, Any]) -> None:
+        """Apply one active lead's assessed risk level and at-risk status, updating stats in place"""
+        # Update lead risk level if changed
+        if risk_assessment["risk_level"] != lead.risk_level.value:
+            old_risk = lead.risk_level.value
+            new_risk = LeadRiskLevel(risk_assessment["risk_level"])
+            
+            lead.risk_level = new_risk
+            lead.sentiment_score = risk_assessment["sentiment_score"]
+            
+            # Log the risk level change
+            await self.logger.log_event(
+                event_type="risk_level_change",
+                details=f"Risk level changed from {old_risk} to {new_risk.value}",
+                lead_id=lead.id,
+                severity="warning" if new_risk == LeadRiskLevel.HIGH else "info"
+            )
+            
+            if new_risk == LeadRiskLevel.HIGH:
+                stats["newly_at_risk"] += 1
+        
+        # High-risk leads (newly or already) are marked at-risk
+        if lead.risk_level == LeadRiskLevel.HIGH and lead.status != LeadStatus.AT_RISK:
+            lead.status = LeadStatus.AT_RISK
+    
+    async def _act_on_lead_risk(self, lead: Lead, stats: Dict[str, int],
+                                risk_assessment: Dict[str, Any],
+                                recent_messages: List[Message],
+                                retention_message: Optional[str] = None) -> None:
+        """
+        Trigger retention actions for one active lead after its risk level update, updating stats in place.
+        retention_message is the pre-generated aggressive offer; None when its generation
+        failed (already logged by _generate_lead_messages).
+        """
+        # Send aggressive offer for high-risk leads (both newly at risk and existing high-risk)
+        if lead.risk_level == LeadRiskLevel.HIGH:
+            # Send aggressive offer for high-risk leads
+            if retention_message is not None:
+                aggressive_offer_sent = await self._send_aggressive_retention_offer(
+                    lead, risk_assessment, retention_message
+                )
+                if aggressive_offer_sent:
+                    stats["aggressive_offers_sent"] += 1
+            
+            # Trigger intervention if engagement engine is available
+            if self.engagement_engine:
+                intervention_sent = await self._trigger_predictive_intervention(
+                    lead, risk_assessment, recent_messages
+                )
+                if intervention_sent:
+                    stats["interventions_triggered"] += 1
+        
+        # Also trigger for leads that are at-risk with medium risk level
+        elif lead.status == LeadStatus.AT_RISK and lead.risk_level == LeadRiskLevel.MEDIUM:
+            # Send intervention for medium-risk at-risk leads
+            if self.engagement_engine:
+                intervention_sent = await self._trigger_predictive_intervention(
+                    lead, risk_assessment, recent_messages
+                )
+                if intervention_sent:
+                    stats["interventions_triggered"] += 1
+        
+        # Check if lead should be moved to cold status
+        if await self._should_move_to_cold(lead, risk_assessment):
+            lead.status = LeadStatus.COLD
+            lead.reason_for_cold = "Automated: No response after risk intervention"
+            stats["moved_to_cold"] += 1
+            
+            self.logger.fire(self.logger.log_lead_status_change(
+                lead, "at_risk", "cold", "Automated: No response after intervention"
+            ))
+    
+    def _aggressive_retention_prompt(self, lead: Lead, risk_assessment: Dict[str, Any]) -> str:
+        """Build the aggressive retention prompt for a high-risk lead, with its most relevant offers"""
+        # Get the most compelling offers for this lead
+        service_keywords = extract_service_keywords(lead.initial_inquiry or "")
+        relevant_offers = []
+        
+        if service_keywords:
+            for keyword in service_keywords:
+                offers = self.db.query(Offer).filter(
+                    Offer.valid_for_service.ilike(f"%{keyword}%"),
+                    Offer.is_active == True
+                ).all()
+                relevant_offers.extend(offers)
+        
+        # If no specific offers, get the most compelling general offers
+        if not relevant_offers:
+            relevant_offers = self.db.query(Offer).filter(
+                Offer.is_active == True
+            ).limit(3).all()
+        
+        return get_aggressive_retention_prompt(
+            lead_name=lead.name,
+            risk_factors=', '.join(risk_assessment.get('risk_factors', [])),
+            sentiment_trend=str(risk_assessment.get('sentiment_trend', [])),
+            days_since_last_contact=f"{risk_assessment.get('last_response_hours', 0) / 24:.1f}",
+            relevant_offers="\n".join([
+                f"- {offer.offer_title}: {offer.description}"
+                for offer in self._unique_offers(relevant_offers)
+            ]) if relevant_offers else "No specific offers available"
+        )
+    
+    async def _send_aggressive_retention_offer(self, lead: Lead, risk_assessment: Dict[str, Any],
+                                               message_content: Optional[str] = None) -> bool:
         """
         Send an aggressive retention offer to a high-risk lead.
         This is the key enhancement for preventing lead loss.
@@ -470,65 +885,20 @@ Create a natural, engaging message that feels like a helpful follow-up from a ca
         Args:
             lead: The high-risk lead
             risk_assessment: Risk assessment details
+            message_content: Pre-generated message; generated here when None
             
         Returns:
             True if aggressive offer was sent successfully
         """
         try:
-            # Get the most compelling offers for this lead
-            service_keywords = extract_service_keywords(lead.initial_inquiry or "")
-            relevant_offers = []
-            
-            if service_keywords:
-                for keyword in service_keywords:
-                    offers = self.db.query(Offer).filter(
-                        Offer.valid_for_service.ilike(f"%{keyword}%"),
-                        Offer.is_active == True
-                    ).all()
-                    relevant_offers.extend(offers)
-            
-            # If no specific offers, get the most compelling general offers
-            if not relevant_offers:
-                relevant_offers = self.db.query(Offer).filter(
-                    Offer.is_active == True
-                ).limit(3).all()
-            
-            # Generate aggressive retention message using AI
-            retention_prompt = f"""
-You are a dental practice AI assistant. Create an AGGRESSIVE retention message for a high-risk lead who is about to be lost.
-
-LEAD CONTEXT:
-- Name: {lead.name}
-- Risk Factors: {', '.join(risk_assessment.get('risk_factors', []))}
-- Sentiment Trend: {risk_assessment.get('sentiment_trend', [])}
-- Days Since Last Contact: {risk_assessment.get('last_response_hours', 0) / 24:.1f}
-
-AVAILABLE OFFERS:
-{chr(10).join([f"- {offer.offer_title}: {offer.description}" for offer in relevant_offers]) if relevant_offers else "No specific offers available"}
-
-MESSAGE REQUIREMENTS:
-- Be URGENT but not desperate
-- Address their specific risk factors
-- Present the most compelling offer prominently
-- Create a sense of urgency and value
-- Make it impossible to ignore
-- Keep it under 200 words
-- Use emotional language that connects with dental anxiety
-
-This lead is about to be lost - you need to save them with an irresistible offer!
-"""
-            
-            response = await self.llm.ainvoke([SystemMessage(content=retention_prompt)])
-            
-            # Save the aggressive retention message
-            message = Message(
-                lead_id=lead.id,
-                sender=SenderType.AI,
-                content=response.content,
-                intent_classification="aggressive_retention"
-            )
+            # Generate aggressive retention message using AI unless it was generated with the batch
+            if message_content is None:
+                message_content = await self._generate_message_content(
+                    self._aggressive_retention_prompt(lead, risk_assessment)
+                )
             
-            self.db.add(message)
+            # Queue the aggressive retention message for the end-of-scan batch insert
+            self._queue_outbound_message(lead, message_content, "aggressive_retention")
             lead.last_contact_at = self._get_timezone_aware_now()
             
             # Log the aggressive retention attempt
@@ -550,20 +920,87 @@ This lead is about to be lost - you need to save them with an irresistible offer
             )
             return False
     
-    async def assess_lead_risk(self, lead: Lead) -> Dict[str, Any]:
+    def _get_recent_messages_by_lead(self, lead_ids: List[int], limit: int) -> Dict[int, List[Message]]:
+        """
+        Fetch the latest messages for a batch of leads with a single ROW_NUMBER() window query.
+        
+        Args:
+            lead_ids: IDs of the leads to fetch messages for
+            limit: Maximum number of messages per lead
+            
+        Returns:
+            Mapping of lead ID to its messages, newest first (leads without messages are omitted)
+        """
+        if not lead_ids:
+            return {}
+        
+        ranked_messages = select(
+            Message.id,
+            func.row_number().over(
+                partition_by=Message.lead_id,
+                order_by=Message.created_at.desc()
+            ).label("position")
+        ).where(Message.lead_id.in_(lead_ids)).subquery()
+        
+        messages = self.db.query(Message).join(
+            ranked_messages, Message.id == ranked_messages.c.id
+        ).filter(
+            ranked_messages.c.position <= limit
+        ).order_by(Message.lead_id, Message.created_at.desc()).all()
+        
+        messages_by_lead: Dict[int, List[Message]] = {}
+        for message in messages:
+            messages_by_lead.setdefault(message.lead_id, []).append(message)
+        
+        return messages_by_lead
+    
+    async def assess_lead_risk(
+        self,
+        lead: Lead,
+        message_count: Optional[int] = None,
+        recent_messages: Optional[List[Message]] = None
+    ) -> Dict[str, Any]:
         """
         Assess the risk level of a single lead based on conversation patterns.
         
         Args:
             lead: The lead to assess
+            message_count: Precomputed total message count. Defaults to the number of
+                recent messages considered (capped at RISK_RECENT_MESSAGE_LIMIT), which is exact for the
+                fewer-than-3 engagement check in determine_lead_risk_level
+            recent_messages: Prefetched latest messages, newest first; queried when not provided
             
         Returns:
             Dictionary containing risk assessment details
         """
+        risk_assessment = self._collect_risk_signals(lead, message_count, recent_messages)
+        
+        # Determine risk level
+        if "risk_level" not in risk_assessment:
+            risk_assessment["risk_level"] = determine_lead_risk_level(
+                sentiment_score=risk_assessment["sentiment_score"],
+                response_gap_hours=int(risk_assessment["last_response_hours"]),
+                message_count=risk_assessment["total_messages"]
+            )
+        
+        return risk_assessment
+    
+    def _collect_risk_signals(
+        self,
+        lead: Lead,
+        message_count: Optional[int] = None,
+        recent_messages: Optional[List[Message]] = None
+    ) -> Dict[str, Any]:
+        """
+        Gather the risk signals for a lead without classifying them.
+        Arguments match assess_lead_risk. The returned assessment only carries a
+        "risk_level" when the lead has no conversation history to score.
+        """
         # Get recent messages for analysis
-        recent_messages = self.db.query(Message).filter(
-            Message.lead_id == lead.id
-        ).order_by(Message.created_at.desc()).limit(10).all()
+        if recent_messages is None:
+            recent_messages = self.db.query(Message).filter(
+                Message.lead_id == lead.id
+            ).order_by(Message.created_at.desc()).limit(RISK_RECENT_MESSAGE_LIMIT).all()
         
         if not recent_messages:
             return {
@@ -573,23 +1010,12 @@ This lead is about to be lost - you need to save them with an irresistible offer
                 "last_response_hours": None
             }
         
-        # Calculate sentiment trend
-        sentiment_scores = []
-        conversation_text = ""
-        
-        for msg in recent_messages:
-            if msg.content:
-                sentiment = analyze_sentiment(msg.content)
-                sentiment_scores.append(sentiment)
-                conversation_text += f"{msg.content} "
+        # Calculate sentiment trend in a single batched pass
+        message_texts = [msg.content for msg in recent_messages if msg.content]
+        sentiment_scores = analyze_sentiment_batch(message_texts)
         
-        # Overall sentiment score (weighted toward recent messages)
-        if sentiment_scores:
-            # Weight recent messages more heavily
-            weights = [i + 1 for i in range(len(sentiment_scores))]
-            weighted_sentiment = sum(s * w for s, w in zip(sentiment_scores, weights)) / sum(weights)
-        else:
-            weighted_sentiment = 0.0
+        # Overall sentiment score (linearly weighted by message position)
+        weighted_sentiment = calculate_weighted_sentiment(sentiment_scores)
         
         # Calculate time since last response
         last_message = recent_messages[0]
@@ -598,19 +1024,8 @@ This lead is about to be lost - you need to save them with an irresistible offer
             last_message.created_at
         ) / 3600
         
-        # Count messages by sender
-        message_counts = self.db.query(
-            Message.sender, func.count(Message.id)
-        ).filter(Message.lead_id == lead.id).group_by(Message.sender).all()
-        
-        total_messages = sum(count for _, count in message_counts)
-        
-        # Determine risk level
-        risk_level = determine_lead_risk_level(
-            sentiment_score=weighted_sentiment,
-            response_gap_hours=int(hours_since_last_contact),
-            message_count=total_messages
-        )
+        # Total messages in the conversation
+        total_messages = message_count if message_count is not None else len(recent_messages)
         
         # Identify specific risk factors
         risk_factors = self._identify_risk_factors(
@@ -618,7 +1033,6 @@ This lead is about to be lost - you need to save them with an irresistible offer
         )
         
         return {
-            "risk_level": risk_level,
             "sentiment_score": weighted_sentiment,
             "sentiment_trend": sentiment_scores[:5],  # Last 5 messages
             "last_response_hours": hours_since_last_contact,
@@ -659,24 +1073,25 @@ This lead is about to be lost - you need to save them with an irresistible offer
         if len(recent_messages) < 3:
             factors.append("Limited conversation engagement")
         
-        # Check for price-related concerns
-        price_keywords = ["expensive", "cost", "price", "afford", "budget", "money", "insurance"]
-        last_few_messages = " ".join([msg.content.lower() for msg in recent_messages[:3]])
+        # Scan the last few messages once for all keyword categories
+        last_few_messages = " ".join([msg.content for msg in recent_messages[:3]])
+        keyword_categories = {
+            match.lastgroup for match in RISK_KEYWORD_PATTERN.finditer(last_few_messages)
+        }
         
-        if any(keyword in last_few_messages for keyword in price_keywords):
+        # Check for price-related concerns
+        if "price" in keyword_categories:
             if sentiment_score < 0:
                 factors.append("Price concerns with negative sentiment")
             else:
                 factors.append("Recent price discussion")
         
         # Check for anxiety indicators
-        anxiety_keywords = ["nervous", "scared", "worried", "anxious", "pain", "hurt"]
-        if any(keyword in last_few_messages for keyword in anxiety_keywords):
+        if "anxiety" in keyword_categories:
             factors.append("Potential dental anxiety")
         
         # Check for competitor mentions
-        competitor_keywords = ["other dentist", "another practice", "comparing", "quote"]
-        if any(keyword in last_few_messages for keyword in competitor_keywords):
+        if "competitor" in keyword_categories:
             factors.append("Considering other options")
         
         # Check if last message was from human staff (might indicate escalation)
@@ -689,7 +1104,8 @@ This lead is about to be lost - you need to save them with an irresistible offer
     async def _trigger_predictive_intervention(
         self, 
         lead: Lead, 
-        risk_assessment: Dict[str, Any]
+        risk_assessment: Dict[str, Any],
+        recent_messages: Optional[List[Message]] = None
     ) -> bool:
         """
         Trigger a predictive intervention for an at-risk lead.
@@ -697,6 +1113,7 @@ This lead is about to be lost - you need to save them with an irresistible offer
         Args:
             lead: The at-risk lead
             risk_assessment: Risk assessment details
+            recent_messages: Prefetched latest messages, newest first; queried when not provided
             
         Returns:
             True if intervention was sent successfully
@@ -706,12 +1123,13 @@ This lead is about to be lost - you need to save them with an irresistible offer
             risk_factors_text = "; ".join(risk_assessment.get("risk_factors", []))
             
             # Get recent conversation for context
-            recent_messages = self.db.query(Message).filter(
-                Message.lead_id == lead.id
-            ).order_by(Message.created_at.desc()).limit(5).all()
+            if recent_messages is None:
+                recent_messages = self.db.query(Message).filter(
+                    Message.lead_id == lead.id
+                ).order_by(Message.created_at.desc()).limit(5).all()
             
             messages_data = []
-            for msg in recent_messages:
+            for msg in recent_messages[:5]:
                 messages_data.append({
                     "sender": msg.sender.value,
                     "content": msg.content,
@@ -726,7 +1144,8 @@ This lead is about to be lost - you need to save them with an irresistible offer
                     lead=lead,
                     risk_factors=risk_factors_text,
                     recent_conversation=recent_conversation,
-                    sentiment_trend=risk_assessment.get("sentiment_trend", [])
+                    sentiment_trend=risk_assessment.get("sentiment_trend", []),
+                    commit=False  # Joins the scan's transaction, committed once at the end
                 )
                 
                 if success:
@@ -740,12 +1159,12 @@ This lead is about to be lost - you need to save them with an irresistible offer
                 return success
             
         except Exception as e:
-            await self.logger.log_error(
+            self.logger.fire(self.logger.log_error(
                 error_type="predictive_intervention",
                 error_message=str(e),
                 lead_id=lead.id,
                 additional_context="Error sending predictive intervention"
-            )
+            ))
         
         return False
     
@@ -768,11 +1187,14 @@ This lead is about to be lost - you need to save them with an irresistible offer
         if lead.status != LeadStatus.AT_RISK:
             return False
         
+        # Never contacted counts as at-risk indefinitely
+        if lead.last_contact_at is None:
+            return True
+        
         # Check if enough time has passed since becoming at-risk
-        hours_at_risk = self._safe_datetime_diff(
-            self._get_timezone_aware_now(), 
-            lead.last_contact_at
-        ) / 3600 if lead.last_contact_at else float('inf')
+        hours_at_risk = (
+            self._get_timezone_aware_now() - lead.last_contact_at.replace(tzinfo=None)
+        ).total_seconds() / 3600
         
         # Move to cold if:
         # - At high risk for more than 7 days, OR
@@ -790,26 +1212,32 @@ This lead is about to be lost - you need to save them with an irresistible offer
         Returns:
             Dictionary containing risk summary statistics
         """
-        # Count leads by risk level
+        # Count leads by risk level; the ROLLUP row (risk_level NULL) carries the total
         risk_counts = self.db.query(
             Lead.risk_level, func.count(Lead.id)
         ).filter(
             Lead.status.in_([LeadStatus.ACTIVE, LeadStatus.AT_RISK])
-        ).group_by(Lead.risk_level).all()
+        ).group_by(func.rollup(Lead.risk_level)).all()
         
-        risk_summary = {level.value: 0 for level in LeadRiskLevel}
+        risk_summary = EMPTY_RISK_SUMMARY.copy()
+        total_active = 0
         for risk_level, count in risk_counts:
-            risk_summary[risk_level.value] = count
+            if risk_level is None:
+                total_active = count
+            else:
+                risk_summary[risk_level.value] = count
         
-        # Get recent at-risk leads
-        recent_at_risk = self.db.query(Lead).filter(
+        # Get recent at-risk leads, loading only the columns serialized below
+        recent_at_risk = self.db.query(Lead).options(
+            load_only(Lead.id, Lead.name, Lead.email, Lead.last_contact_at, Lead.sentiment_score)
+        ).filter(
             Lead.status == LeadStatus.AT_RISK,
             Lead.risk_level == LeadRiskLevel.HIGH
         ).order_by(Lead.last_contact_at.desc()).limit(10).all()
         
         return {
             "risk_distribution": risk_summary,
-            "total_active": sum(risk_summary.values()),
+            "total_active": total_active,
             "high_risk_count": risk_summary.get("high", 0),
             "recent_high_risk_leads": [
                 {
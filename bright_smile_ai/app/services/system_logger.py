@@ -1,28 +1,65 @@
 """
 SystemLogger Service - Handles system event logging and monitoring
 """
+import asyncio
+import contextlib
+import logging
+import time
 from datetime import datetime, timedelta
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Optional, Dict, List, Set, Tuple, Awaitable, Iterator
+from sqlalchemy import case, func, insert, text, tuple_
+from sqlalchemy.orm import Session, load_only
 
 from app.db.models import SystemEvent, Lead
 
+logger = logging.getLogger(__name__)
+
+# Buffer size for loggers owned by batch jobs that log once or more per lead
+LOG_BATCH_SIZE = 200
+
+# How long a computed 24h health summary is reused across dashboard polls
+HEALTH_SUMMARY_CACHE_TTL_SECONDS = 15
+
+# Weekly system_events partitions kept ready beyond the current week
+EVENT_PARTITION_WEEKS_AHEAD = 4
+
 
 class SystemLogger:
     """
     Service responsible for logging system events, errors, and monitoring activities.
     Provides centralized logging for audit trails and system monitoring.
+    
+    With the default batch_size of 1 every event is committed as it is logged.
+    A larger batch_size buffers events and writes them with one bulk insert and
+    commit per batch; owners of a buffered logger must call flush() when done.
+    A logger can also be buffered for just the span of a batch job with buffered().
+    
+    With autocommit=False event writes are only flushed, so they join the
+    caller's open transaction and are committed by the caller's own commit.
+    
+    Writes go through the caller's synchronous session on the event loop thread.
+    That session is shared with the caller's own work (including the per-lead
+    work in RiskAnalyzer's scans), so writes are not handed off to a worker
+    thread; buffering is how the hot paths keep commits off the loop.
     """
     
-    def __init__(self, db: Session):
+    # Process-wide (expires_at, summary) for get_system_health_summary, per database URL
+    _health_summary_cache: Dict[str, Tuple[float, dict]] = {}
+    
+    def __init__(self, db: Session, batch_size: int = 1, autocommit: bool = True):
         self.db = db
+        self.batch_size = batch_size
+        self.autocommit = autocommit
+        self._pending_events: List[SystemEvent] = []
+        self._background_tasks: Set[asyncio.Task] = set()
     
     async def log_event(
         self,
         event_type: str,
         details: Optional[str] = None,
         lead_id: Optional[int] = None,
-        severity: str = "info"
+        severity: str = "info",
+        category: Optional[str] = None
     ) -> SystemEvent:
         """
         Log a system event.
@@ -32,23 +69,132 @@ class SystemLogger:
             details: Additional details about the event
             lead_id: Associated lead ID if applicable
             severity: Event severity ('info', 'warning', 'error')
+            category: Event category; defaults to the event type's prefix before the first '_'
         
         Returns:
-            Created SystemEvent instance
+            Created SystemEvent instance, committed but not refreshed
+            (not yet persisted when buffered)
         """
         event = SystemEvent(
             event_type=event_type,
+            category=(category or event_type.split("_", 1)[0])[:16],
             details=details,
             lead_id=lead_id,
             severity=severity
         )
         
+        if self.batch_size > 1:
+            self._pending_events.append(event)
+            if len(self._pending_events) >= self.batch_size:
+                self.flush()
+            return event
+        
+        # No refresh: callers never read server-generated columns back, and any
+        # later attribute access reloads the expired instance on demand
         self.db.add(event)
-        self.db.commit()
-        self.db.refresh(event)
+        self._finish_write()
         
         return event
     
+    @contextlib.contextmanager
+    def buffered(self, batch_size: int = LOG_BATCH_SIZE) -> Iterator["SystemLogger"]:
+        """
+        Buffer events for the span of a with block, e.g. a batch job on a shared logger.
+        On exit, even when the block raises, the previous batch_size is restored
+        and the buffered events are written.
+        
+        Args:
+            batch_size: Buffer size used inside the block
+        """
+        previous_batch_size = self.batch_size
+        self.batch_size = batch_size
+        try:
+            yield self
+        finally:
+            self.batch_size = previous_batch_size
+            self.flush()
+    
+    def fire(self, log_call: Awaitable[SystemEvent]) -> asyncio.Task:
+        """
+        Schedule a log_* call without waiting for it, e.g.
+        logger.fire(logger.log_error(...)). Owners must await drain() before
+        their final flush() so fired events are not left behind.
+        
+        Args:
+            log_call: Un-awaited log_* coroutine
+        
+        Returns:
+            The scheduled task
+        """
+        task = asyncio.get_running_loop().create_task(log_call)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    async def drain(self) -> None:
+        """Wait for every log call scheduled with fire() to finish"""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+    
+    def flush(self) -> int:
+        """
+        Write all buffered events with one bulk insert and a single commit
+        (or flush, without autocommit).
+        
+        Returns:
+            Number of events written
+        """
+        if not self._pending_events:
+            return 0
+        
+        events = self._pending_events
+        self._pending_events = []
+        
+        return self.log_events_bulk([
+            {
+                "event_type": event.event_type,
+                "category": event.category,
+                "details": event.details,
+                "lead_id": event.lead_id,
+                "severity": event.severity
+            }
+            for event in events
+        ])
+    
+    def log_events_bulk(self, rows: List[dict]) -> int:
+        """
+        Insert many events with a single executemany INSERT and one commit
+        (or flush, without autocommit).
+        
+        Args:
+            rows: Event column values (event_type, category, details, lead_id, severity)
+        
+        Returns:
+            Number of events written
+        """
+        if not rows:
+            return 0
+        
+        self.db.execute(insert(SystemEvent), rows)
+        self._finish_write()
+        
+        return len(rows)
+    
+    def _finish_write(self) -> None:
+        """
+        Commit event writes, or only flush them into the caller's transaction.
+        Either way the cached health summary for this database is dropped.
+        """
+        if self.autocommit:
+            self.db.commit()
+        else:
+            self.db.flush()
+        SystemLogger._health_summary_cache.pop(self._health_cache_key(), None)
+    
+    def _health_cache_key(self) -> str:
+        """Key the health summary cache by the database the session is bound to"""
+        return str(self.db.get_bind().url)
+    
     async def log_lead_status_change(
         self,
         lead: Lead,
@@ -68,9 +214,9 @@ class SystemLogger:
         Returns:
             Created SystemEvent instance
         """
-        details = f"Lead status changed from '{old_status}' to '{new_status}'"
-        if reason:
-            details += f". Reason: {reason}"
+        details = f"Lead status changed from '{old_status}' to '{new_status}'" + (
+            f". Reason: {reason}" if reason else ""
+        )
         
         return await self.log_event(
             event_type="lead_status_change",
@@ -100,11 +246,12 @@ class SystemLogger:
         Returns:
             Created SystemEvent instance
         """
-        details = f"AI {interaction_type} - {'Success' if success else 'Failed'}"
+        parts = [f"AI {interaction_type} - {'Success' if success else 'Failed'}"]
         if response_time_ms:
-            details += f" (Response time: {response_time_ms}ms)"
+            parts.append(f" (Response time: {response_time_ms}ms)")
         if error_message:
-            details += f" Error: {error_message}"
+            parts.append(f" Error: {error_message}")
+        details = "".join(parts)
         
         severity = "info" if success else "error"
         
@@ -112,7 +259,8 @@ class SystemLogger:
             event_type=f"ai_{interaction_type}",
             details=details,
             lead_id=lead_id,
-            severity=severity
+            severity=severity,
+            category="ai"
         )
     
     async def log_outreach_campaign(
@@ -166,15 +314,18 @@ class SystemLogger:
         Returns:
             Created SystemEvent instance
         """
-        details = f"Error: {error_message}"
-        if additional_context:
-            details += f" Context: {additional_context}"
+        details = (
+            f"Error: {error_message} Context: {additional_context}"
+            if additional_context
+            else f"Error: {error_message}"
+        )
         
         return await self.log_event(
             event_type=f"error_{error_type}",
             details=details,
             lead_id=lead_id,
-            severity="error"
+            severity="error",
+            category="error"
         )
     
     def get_recent_events(
@@ -182,19 +333,23 @@ class SystemLogger:
         limit: int = 100,
         event_type: Optional[str] = None,
         lead_id: Optional[int] = None,
-        severity: Optional[str] = None
+        severity: Optional[str] = None,
+        before: Optional[Tuple[datetime, int]] = None
     ) -> List[SystemEvent]:
         """
         Get recent system events with optional filtering.
+        Pages are fetched by keyset: pass the cursor of the previous page as
+        `before` (see get_events_cursor) instead of an offset.
         
         Args:
             limit: Maximum number of events to return
             event_type: Filter by event type
             lead_id: Filter by lead ID
             severity: Filter by severity
+            before: (created_at, id) of the last event already seen
         
         Returns:
-            List of SystemEvent instances
+            List of SystemEvent instances, newest first
         """
         query = self.db.query(SystemEvent)
         
@@ -204,25 +359,101 @@ class SystemLogger:
             query = query.filter(SystemEvent.lead_id == lead_id)
         if severity:
             query = query.filter(SystemEvent.severity == severity)
+        if before:
+            query = query.filter(tuple_(SystemEvent.created_at, SystemEvent.id) < tuple_(*before))
         
-        return query.order_by(SystemEvent.created_at.desc()).limit(limit).all()
+        return query.order_by(
+            SystemEvent.created_at.desc(), SystemEvent.id.desc()
+        ).limit(limit).all()
     
-    def get_error_events(self, hours: int = 24) -> List[SystemEvent]:
+    @staticmethod
+    def get_events_cursor(events: List[SystemEvent], limit: int) -> Optional[Tuple[datetime, int]]:
+        """
+        Get the keyset cursor for the page after `events`.
+        
+        Args:
+            events: A page returned by get_recent_events
+            limit: The limit the page was fetched with
+        
+        Returns:
+            (created_at, id) of the last event, or None when there are no more pages
+        """
+        if len(events) < limit:
+            return None
+        
+        return (events[-1].created_at, events[-1].id)
+    
+    def get_error_events(self, hours: int = 24, limit: int = 500) -> List[SystemEvent]:
         """
         Get error events from the last N hours.
         
         Args:
             hours: Number of hours to look back
+            limit: Maximum number of events to return
         
         Returns:
-            List of error SystemEvent instances
+            List of error SystemEvent instances, newest first
+        """
+        return self._error_events_query(hours).limit(limit).all()
+    
+    def iter_error_events(self, hours: int = 24, batch_size: int = 200) -> Iterator[SystemEvent]:
         """
+        Stream all error events from the last N hours without materializing them,
+        for exports. Only the columns the export reads are loaded.
+        
+        Args:
+            hours: Number of hours to look back
+            batch_size: Rows fetched from the database cursor at a time
+        
+        Returns:
+            Iterator over error SystemEvent instances, newest first
+        """
+        query = self._error_events_query(hours).options(
+            load_only(
+                SystemEvent.id, SystemEvent.event_type, SystemEvent.category,
+                SystemEvent.details, SystemEvent.severity, SystemEvent.processed,
+                SystemEvent.lead_id, SystemEvent.created_at
+            )
+        )
+        return iter(query.yield_per(batch_size))
+    
+    def _error_events_query(self, hours: int):
+        """Build the ordered error-event query shared by get_error_events and iter_error_events"""
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
         
         return self.db.query(SystemEvent).filter(
             SystemEvent.severity == "error",
             SystemEvent.created_at >= cutoff_time
-        ).order_by(SystemEvent.created_at.desc()).all()
+        ).order_by(SystemEvent.created_at.desc(), SystemEvent.id.desc())
+    
+    def ensure_event_partitions(self, weeks_ahead: int = EVENT_PARTITION_WEEKS_AHEAD) -> None:
+        """
+        Create the weekly system_events partitions (PostgreSQL) from the current
+        week through `weeks_ahead` weeks ahead, skipping ones that already exist.
+        Old weeks can be removed with DROP TABLE on their partition.
+        
+        Each week is committed on its own. A week that cannot be created (e.g. because
+        its rows already landed in the DEFAULT partition) is logged and skipped
+        without undoing the other weeks.
+        
+        Args:
+            weeks_ahead: Number of future weeks to prepare
+        """
+        today = datetime.utcnow().date()
+        week_start = today - timedelta(days=today.weekday())
+        
+        for week in range(weeks_ahead + 1):
+            start = week_start + timedelta(weeks=week)
+            end = start + timedelta(weeks=1)
+            try:
+                self.db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS system_events_p{start:%Y%m%d} "
+                    f"PARTITION OF system_events FOR VALUES FROM ('{start}') TO ('{end}')"
+                ))
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"Could not create the system_events partition for week {start}: {e}")
     
     def mark_event_processed(self, event_id: int) -> Optional[SystemEvent]:
         """
@@ -245,40 +476,41 @@ class SystemLogger:
     def get_system_health_summary(self) -> dict:
         """
         Get a summary of system health based on recent events.
+        The summary is cached per database for HEALTH_SUMMARY_CACHE_TTL_SECONDS,
+        since the 24h window barely moves between dashboard polls. Events written
+        through a SystemLogger drop the cache; writes from other processes can
+        show up to the TTL late.
         
         Returns:
             Dictionary containing system health metrics
         """
-        from datetime import timedelta
+        cache_key = self._health_cache_key()
+        cached = SystemLogger._health_summary_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
         
         # Look at the last 24 hours
         cutoff_time = datetime.utcnow() - timedelta(hours=24)
         
-        # Count events by severity
-        total_events = self.db.query(SystemEvent).filter(
+        # Count events by severity and AI interactions in a single pass over the window
+        counts = self.db.query(
+            func.count(SystemEvent.id).label("total"),
+            func.coalesce(func.sum(case((SystemEvent.severity == "error", 1), else_=0)), 0).label("errors"),
+            func.coalesce(func.sum(case((SystemEvent.severity == "warning", 1), else_=0)), 0).label("warnings"),
+            func.coalesce(func.sum(case((SystemEvent.category == "ai", 1), else_=0)), 0).label("ai")
+        ).filter(
             SystemEvent.created_at >= cutoff_time
-        ).count()
+        ).one()
         
-        error_events = self.db.query(SystemEvent).filter(
-            SystemEvent.created_at >= cutoff_time,
-            SystemEvent.severity == "error"
-        ).count()
-        
-        warning_events = self.db.query(SystemEvent).filter(
-            SystemEvent.created_at >= cutoff_time,
-            SystemEvent.severity == "warning"
-        ).count()
-        
-        # Count AI interactions
-        ai_events = self.db.query(SystemEvent).filter(
-            SystemEvent.created_at >= cutoff_time,
-            SystemEvent.event_type.like("ai_%")
-        ).count()
+        total_events = counts.total
+        error_events = counts.errors
+        warning_events = counts.warnings
+        ai_events = counts.ai
         
         # Calculate error rate
         error_rate = (error_events / total_events * 100) if total_events > 0 else 0
         
-        return {
+        summary = {
             "period_hours": 24,
             "total_events": total_events,
             "error_events": error_events,
@@ -286,4 +518,9 @@ class SystemLogger:
             "ai_interactions": ai_events,
             "error_rate_percent": round(error_rate, 2),
             "status": "healthy" if error_rate < 5 else "degraded" if error_rate < 15 else "unhealthy"
-        }
\ No newline at end of file
+        }
+        SystemLogger._health_summary_cache[cache_key] = (
+            time.monotonic() + HEALTH_SUMMARY_CACHE_TTL_SECONDS, summary
+        )
+        
+        return dict(summary)
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""Add system_events created_at/severity index
+
+Revision ID: 4b1e7d2a9c30
+Revises: c97037ac6947
+Create Date: 2026-10-16 09:12:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1e7d2a9c30'
+down_revision: Union[str, Sequence[str], None] = 'c97037ac6947'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_system_events_created_at_severity', 'system_events', ['created_at', 'severity'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_system_events_created_at_severity', table_name='system_events')
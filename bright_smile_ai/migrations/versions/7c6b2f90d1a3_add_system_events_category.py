@@ -0,0 +1,31 @@
+"""Add system_events category
+
+Revision ID: 7c6b2f90d1a3
+Revises: e2a85c41f7b9
+Create Date: 2026-10-16 11:05:18.447392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c6b2f90d1a3'
+down_revision: Union[str, Sequence[str], None] = 'e2a85c41f7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('system_events', sa.Column('category', sa.String(length=16), nullable=True, comment="Event type prefix, e.g. 'ai' or 'error'"))
+    op.execute("UPDATE system_events SET category = left(split_part(event_type, '_', 1), 16)")
+    op.create_index(op.f('ix_system_events_category'), 'system_events', ['category'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_system_events_category'), table_name='system_events')
+    op.drop_column('system_events', 'category')
@@ -0,0 +1,28 @@
+"""Add leads status/risk_level/last_contact_at index
+
+Revision ID: 9d3f0a6b1e54
+Revises: 4b1e7d2a9c30
+Create Date: 2026-10-16 09:47:05.602914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f0a6b1e54'
+down_revision: Union[str, Sequence[str], None] = '4b1e7d2a9c30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_leads_status_risk_level_last_contact_at', 'leads', ['status', 'risk_level', 'last_contact_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_leads_status_risk_level_last_contact_at', table_name='leads')
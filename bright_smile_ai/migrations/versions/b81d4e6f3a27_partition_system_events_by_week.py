@@ -0,0 +1,127 @@
+"""Partition system_events by week of created_at
+
+Revision ID: b81d4e6f3a27
+Revises: 7c6b2f90d1a3
+Create Date: 2026-10-16 11:48:52.093615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d4e6f3a27'
+down_revision: Union[str, Sequence[str], None] = '7c6b2f90d1a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Index name -> columns, recreated on the partitioned table
+SYSTEM_EVENT_INDEXES = {
+    'ix_system_events_id': ['id'],
+    'ix_system_events_lead_id': ['lead_id'],
+    'ix_system_events_event_type': ['event_type'],
+    'ix_system_events_category': ['category'],
+    'ix_system_events_severity': ['severity'],
+    'ix_system_events_processed': ['processed'],
+    'ix_system_events_created_at': ['created_at'],
+    'ix_system_events_created_at_severity': ['created_at', 'severity'],
+    'ix_system_events_created_at_id': ['created_at', 'id'],
+    'ix_system_events_severity_created_at_id': ['severity', 'created_at', 'id'],
+    'ix_system_events_event_type_created_at_id': ['event_type', 'created_at', 'id'],
+}
+
+# Weekly partitions created beyond the current week; SystemLogger.ensure_event_partitions keeps this topped up
+WEEKS_AHEAD = 4
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE system_events RENAME TO system_events_unpartitioned")
+    op.execute("ALTER TABLE system_events_unpartitioned RENAME CONSTRAINT system_events_pkey TO system_events_unpartitioned_pkey")
+    op.execute("ALTER SEQUENCE system_events_id_seq OWNED BY NONE")
+    for index_name in SYSTEM_EVENT_INDEXES:
+        op.execute(f"ALTER INDEX {index_name} RENAME TO {index_name}_unpartitioned")
+    
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE system_events (
+            id INTEGER NOT NULL DEFAULT nextval('system_events_id_seq'),
+            lead_id INTEGER REFERENCES leads (id) ON DELETE CASCADE,
+            event_type VARCHAR(100) NOT NULL,
+            category VARCHAR(16),
+            details TEXT,
+            severity VARCHAR(20),
+            processed BOOLEAN,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("COMMENT ON COLUMN system_events.category IS 'Event type prefix, e.g. ''ai'' or ''error'''")
+    op.execute("CREATE TABLE system_events_default PARTITION OF system_events DEFAULT")
+    
+    # One partition per ISO week from the oldest stored event through WEEKS_AHEAD weeks from now
+    op.execute(f"""
+        DO $$
+        DECLARE
+            week_start DATE;
+        BEGIN
+            FOR week_start IN
+                SELECT generate_series(
+                    date_trunc('week', COALESCE((SELECT min(created_at) FROM system_events_unpartitioned), now())),
+                    date_trunc('week', now()) + interval '{WEEKS_AHEAD} weeks',
+                    interval '1 week'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE system_events_p%s PARTITION OF system_events FOR VALUES FROM (%L) TO (%L)',
+                    to_char(week_start, 'YYYYMMDD'), week_start, week_start + 7
+                );
+            END LOOP;
+        END $$
+    """)
+    
+    op.execute("""
+        INSERT INTO system_events (id, lead_id, event_type, category, details, severity, processed, created_at)
+        SELECT id, lead_id, event_type, category, details, severity, processed, created_at
+        FROM system_events_unpartitioned
+    """)
+    op.execute("DROP TABLE system_events_unpartitioned")
+    op.execute("ALTER SEQUENCE system_events_id_seq OWNED BY system_events.id")
+    
+    for index_name, columns in SYSTEM_EVENT_INDEXES.items():
+        op.create_index(index_name, 'system_events', columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE system_events RENAME TO system_events_partitioned")
+    op.execute("ALTER TABLE system_events_partitioned RENAME CONSTRAINT system_events_pkey TO system_events_partitioned_pkey")
+    op.execute("ALTER SEQUENCE system_events_id_seq OWNED BY NONE")
+    for index_name in SYSTEM_EVENT_INDEXES:
+        op.execute(f"ALTER INDEX {index_name} RENAME TO {index_name}_partitioned")
+    
+    op.execute("""
+        CREATE TABLE system_events (
+            id INTEGER NOT NULL DEFAULT nextval('system_events_id_seq') PRIMARY KEY,
+            lead_id INTEGER REFERENCES leads (id) ON DELETE CASCADE,
+            event_type VARCHAR(100) NOT NULL,
+            category VARCHAR(16),
+            details TEXT,
+            severity VARCHAR(20),
+            processed BOOLEAN,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("COMMENT ON COLUMN system_events.category IS 'Event type prefix, e.g. ''ai'' or ''error'''")
+    op.execute("""
+        INSERT INTO system_events (id, lead_id, event_type, category, details, severity, processed, created_at)
+        SELECT id, lead_id, event_type, category, details, severity, processed, created_at
+        FROM system_events_partitioned
+    """)
+    op.execute("DROP TABLE system_events_partitioned")
+    op.execute("ALTER SEQUENCE system_events_id_seq OWNED BY system_events.id")
+    
+    for index_name, columns in SYSTEM_EVENT_INDEXES.items():
+        op.create_index(index_name, 'system_events', columns, unique=False)
@@ -0,0 +1,32 @@
+"""Add system_events keyset pagination indexes
+
+Revision ID: e2a85c41f7b9
+Revises: 9d3f0a6b1e54
+Create Date: 2026-10-16 10:21:33.874120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a85c41f7b9'
+down_revision: Union[str, Sequence[str], None] = '9d3f0a6b1e54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_system_events_created_at_id', 'system_events', ['created_at', 'id'], unique=False)
+    op.create_index('ix_system_events_severity_created_at_id', 'system_events', ['severity', 'created_at', 'id'], unique=False)
+    op.create_index('ix_system_events_event_type_created_at_id', 'system_events', ['event_type', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_system_events_event_type_created_at_id', table_name='system_events')
+    op.drop_index('ix_system_events_severity_created_at_id', table_name='system_events')
+    op.drop_index('ix_system_events_created_at_id', table_name='system_events')
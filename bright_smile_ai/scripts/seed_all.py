@@ -3,624 +3,576 @@ Master seeding script that clears the database and recreates all data
 """
 import sys
 import os
+import random
+import logging
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from faker import Faker
+from sqlalchemy import insert, text
 
 # Add the parent directory to the path so we can import our app modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.db.base import SessionLocal, engine, Base
+from app.db.base import Base
 from app.db.models import (
     Lead, Message, Offer, Testimonial, FinancialExplainer, 
-    SystemEvent, AIInteraction, LeadScore, LeadStatus, LeadRiskLevel, SenderType
+    SystemEvent, AIInteraction, LeadScore, LeadStatus, LeadRiskLevel
 )
-from app.core.utils import analyze_sentiment
+from app.core.utils import analyze_sentiment_batch
+from scripts.seed_utils import SENDER_TYPES, SeedSessionLocal, get_fake, random_time_within, seed_engine
 
-fake = Faker()
+logger = logging.getLogger("seed")
 
+# (low, high) ranges for the engagement, intent, urgency and budget scores by lead status
+LEAD_SCORE_RANGES = {
+    LeadStatus.CONVERTED: ((0.8, 1.0), (0.9, 1.0), (0.7, 1.0), (0.6, 1.0)),
+    LeadStatus.ACTIVE: ((0.6, 0.9), (0.7, 0.9), (0.5, 0.8), (0.5, 0.8)),
+    LeadStatus.AT_RISK: ((0.3, 0.6), (0.4, 0.7), (0.6, 0.9), (0.2, 0.5)),
+}
+DEFAULT_LEAD_SCORE_RANGES = ((0.1, 0.5), (0.2, 0.6), (0.3, 0.7), (0.3, 0.7))  # NEW, COLD, etc.
 
-def clear_database():
-    """Clear all data from the database"""
-    print("🗑️ Clearing all existing data from database...")
+def clear_database(recreate=False):
+    """Clear all data from the database, dropping and recreating the tables only when asked"""
+    logger.info("🗑️ Clearing all existing data from database...")
     
-    # Drop all tables and recreate them
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    if recreate:
+        # Drop all tables and recreate them
+        Base.metadata.drop_all(bind=seed_engine)
+        Base.metadata.create_all(bind=seed_engine)
+        
+        logger.info("✅ Database cleared and tables recreated successfully!")
+        return
+    
+    # Create any missing tables, then empty them all in one statement
+    Base.metadata.create_all(bind=seed_engine)
+    table_names = ", ".join(table.name for table in reversed(Base.metadata.sorted_tables))
+    with seed_engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {table_names} RESTART IDENTITY CASCADE"))
     
-    print("✅ Database cleared and tables recreated successfully!")
+    logger.info("✅ Database cleared successfully!")
 
 
-def create_sample_offers():
+def create_sample_offers(db):
     """Create sample promotional offers"""
     
-    db = SessionLocal()
+    logger.info("🎁 Creating sample offers...")
     
-    try:
-        print("🎁 Creating sample offers...")
-        
-        offers_data = [
-            {
-                "offer_title": "New Patient Special: Comprehensive Exam & Cleaning",
-                "description": "Complete dental exam, professional cleaning, and digital X-rays for new patients. Regular value $350, now just $149!",
-                "valid_for_service": "General",
-                "discount_amount": Decimal("201.00"),
-                "is_active": True,
-                "expires_at": datetime.now(timezone.utc) + timedelta(days=90)
-            },
-            {
-                "offer_title": "Invisalign Summer Smile Special",
-                "description": "Save $1,500 on Invisalign clear aligner treatment. Includes complimentary whitening treatment upon completion!",
-                "valid_for_service": "Invisalign",
-                "discount_amount": Decimal("1500.00"),
-                "is_active": True,
-                "expires_at": datetime.now(timezone.utc) + timedelta(days=120)
-            },
-            {
-                "offer_title": "Professional Teeth Whitening Package",
-                "description": "Take-home whitening kit plus one in-office whitening session. Brighten your smile by up to 8 shades!",
-                "valid_for_service": "Whitening",
-                "discount_percentage": 25.0,
-                "is_active": True,
-                "expires_at": datetime.now(timezone.utc) + timedelta(days=60)
-            },
-            {
-                "offer_title": "Dental Implant Consultation Special",
-                "description": "Complimentary consultation and 3D imaging for dental implant candidates. Includes treatment planning session.",
-                "valid_for_service": "Implants",
-                "discount_amount": Decimal("200.00"),
-                "is_active": True,
-                "expires_at": datetime.now(timezone.utc) + timedelta(days=180)
-            },
-            {
-                "offer_title": "Family Dental Package",
-                "description": "Cleanings and exams for the whole family (up to 4 family members). Includes fluoride treatment for kids under 16.",
-                "valid_for_service": "General",
-                "discount_percentage": 20.0,
-                "is_active": True,
-                "expires_at": datetime.now(timezone.utc) + timedelta(days=45)
-            }
-        ]
-        
-        created_offers = []
-        
-        for offer_data in offers_data:
-            offer = Offer(**offer_data)
-            db.add(offer)
-            created_offers.append(offer)
-        
-        db.commit()
-        
-        print(f"✅ Created {len(created_offers)} sample offers successfully!")
-        
-        return created_offers
-        
-    except Exception as e:
-        print(f"❌ Error creating sample offers: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    now = datetime.now(timezone.utc)
+    
+    offers_data = [
+        {
+            "offer_title": "New Patient Special: Comprehensive Exam & Cleaning",
+            "description": "Complete dental exam, professional cleaning, and digital X-rays for new patients. Regular value $350, now just $149!",
+            "valid_for_service": "General",
+            "discount_amount": Decimal("201.00"),
+            "is_active": True,
+            "expires_at": now + timedelta(days=90)
+        },
+        {
+            "offer_title": "Invisalign Summer Smile Special",
+            "description": "Save $1,500 on Invisalign clear aligner treatment. Includes complimentary whitening treatment upon completion!",
+            "valid_for_service": "Invisalign",
+            "discount_amount": Decimal("1500.00"),
+            "is_active": True,
+            "expires_at": now + timedelta(days=120)
+        },
+        {
+            "offer_title": "Professional Teeth Whitening Package",
+            "description": "Take-home whitening kit plus one in-office whitening session. Brighten your smile by up to 8 shades!",
+            "valid_for_service": "Whitening",
+            "discount_percentage": 25.0,
+            "is_active": True,
+            "expires_at": now + timedelta(days=60)
+        },
+        {
+            "offer_title": "Dental Implant Consultation Special",
+            "description": "Complimentary consultation and 3D imaging for dental implant candidates. Includes treatment planning session.",
+            "valid_for_service": "Implants",
+            "discount_amount": Decimal("200.00"),
+            "is_active": True,
+            "expires_at": now + timedelta(days=180)
+        },
+        {
+            "offer_title": "Family Dental Package",
+            "description": "Cleanings and exams for the whole family (up to 4 family members). Includes fluoride treatment for kids under 16.",
+            "valid_for_service": "General",
+            "discount_percentage": 20.0,
+            "is_active": True,
+            "expires_at": now + timedelta(days=45)
+        }
+    ]
+    
+    db.execute(insert(Offer), offers_data)
+    
+    logger.info(f"✅ Created {len(offers_data)} sample offers successfully!")
+    
+    return offers_data
 
 
-def create_sample_testimonials():
+def create_sample_testimonials(db):
     """Create sample patient testimonials"""
     
-    db = SessionLocal()
+    logger.info("⭐ Creating sample testimonials...")
     
-    try:
-        print("⭐ Creating sample testimonials...")
-        
-        testimonials_data = [
-            # General testimonials
-            {
-                "service_category": "General",
-                "snippet_text": "Dr. Smith and the entire team at Bright Smile Clinic are absolutely amazing! They made my dental anxiety completely disappear. The office is modern, clean, and the staff is so caring. I actually look forward to my appointments now!",
-                "patient_name": "Sarah M.",
-                "rating": 5,
-                "is_verified": True
-            },
-            {
-                "service_category": "General",
-                "snippet_text": "I've been coming here for 3 years and have never had a bad experience. They're always on time, gentle, and explain everything clearly. My kids actually love coming to the dentist now!",
-                "patient_name": "Michael R.",
-                "rating": 5,
-                "is_verified": True
-            },
-            {
-                "service_category": "Invisalign",
-                "snippet_text": "I got Invisalign at 34 and it was the best decision ever! The process was so much easier than I expected. My teeth are perfectly straight now and I feel so much more confident. The payment plan made it very affordable too.",
-                "patient_name": "Emily T.",
-                "rating": 5,
-                "is_verified": True
-            },
-            {
-                "service_category": "Implants",
-                "snippet_text": "I lost a front tooth in an accident and was devastated. Dr. Johnson placed my implant and it looks and feels exactly like my natural teeth. You can't even tell which one is the implant!",
-                "patient_name": "Robert C.",
-                "rating": 5,
-                "is_verified": True
-            },
-            {
-                "service_category": "Whitening",
-                "snippet_text": "The professional whitening here is amazing! My teeth were 6 shades whiter after just one session. Way better than the strips I tried at home, and no sensitivity at all.",
-                "patient_name": "Jessica P.",
-                "rating": 5,
-                "is_verified": True
-            }
-        ]
-        
-        created_testimonials = []
-        
-        for testimonial_data in testimonials_data:
-            testimonial = Testimonial(**testimonial_data)
-            db.add(testimonial)
-            created_testimonials.append(testimonial)
-        
-        db.commit()
-        
-        print(f"✅ Created {len(created_testimonials)} sample testimonials successfully!")
-        
-        return created_testimonials
-        
-    except Exception as e:
-        print(f"❌ Error creating sample testimonials: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    testimonials_data = [
+        # General testimonials
+        {
+            "service_category": "General",
+            "snippet_text": "Dr. Smith and the entire team at Bright Smile Clinic are absolutely amazing! They made my dental anxiety completely disappear. The office is modern, clean, and the staff is so caring. I actually look forward to my appointments now!",
+            "patient_name": "Sarah M.",
+            "rating": 5,
+            "is_verified": True
+        },
+        {
+            "service_category": "General",
+            "snippet_text": "I've been coming here for 3 years and have never had a bad experience. They're always on time, gentle, and explain everything clearly. My kids actually love coming to the dentist now!",
+            "patient_name": "Michael R.",
+            "rating": 5,
+            "is_verified": True
+        },
+        {
+            "service_category": "Invisalign",
+            "snippet_text": "I got Invisalign at 34 and it was the best decision ever! The process was so much easier than I expected. My teeth are perfectly straight now and I feel so much more confident. The payment plan made it very affordable too.",
+            "patient_name": "Emily T.",
+            "rating": 5,
+            "is_verified": True
+        },
+        {
+            "service_category": "Implants",
+            "snippet_text": "I lost a front tooth in an accident and was devastated. Dr. Johnson placed my implant and it looks and feels exactly like my natural teeth. You can't even tell which one is the implant!",
+            "patient_name": "Robert C.",
+            "rating": 5,
+            "is_verified": True
+        },
+        {
+            "service_category": "Whitening",
+            "snippet_text": "The professional whitening here is amazing! My teeth were 6 shades whiter after just one session. Way better than the strips I tried at home, and no sensitivity at all.",
+            "patient_name": "Jessica P.",
+            "rating": 5,
+            "is_verified": True
+        }
+    ]
+    
+    db.execute(insert(Testimonial), testimonials_data)
+    
+    logger.info(f"✅ Created {len(testimonials_data)} sample testimonials successfully!")
+    
+    return testimonials_data
 
 
-def create_sample_leads():
+def create_sample_leads(db):
     """Create 5 sample leads with realistic data"""
     
-    db = SessionLocal()
+    logger.info("🌱 Creating 5 sample leads...")
     
-    try:
-        print("🌱 Creating 5 sample leads...")
-        
-        # Lead scenarios with realistic inquiries and conversation patterns
-        lead_scenarios = [
-            # Active, engaged lead
-            {
-                "name": "Sarah Johnson",
-                "email": "sarah.johnson@email.com",
-                "phone": "555-0101",
-                "initial_inquiry": "Hi, I'm interested in Invisalign treatment. Can you tell me more about the process and costs?",
-                "status": LeadStatus.ACTIVE,
-                "risk_level": LeadRiskLevel.LOW,
-                "messages": [
-                    ("lead", "Hi, I'm interested in Invisalign treatment. Can you tell me more about the process and costs?", 0),
-                    ("ai", "Hello Sarah! I'd be happy to help you learn about Invisalign. It's a popular choice for straightening teeth discreetly. The treatment typically takes 12-18 months and uses clear aligners that are virtually invisible. Would you like me to create a personalized cost breakdown for you?", 10),
-                    ("lead", "Yes, that would be great! I'm also wondering about payment plans.", 60),
-                    ("ai", "Excellent! We offer flexible payment plans to make treatment affordable. Let me prepare a detailed financial explainer for you that will include payment options.", 5)
-                ]
-            },
-            
-            # Price-concerned lead (at risk)
-            {
-                "name": "Michael Chen",
-                "email": "michael.chen@email.com", 
-                "phone": "555-0102",
-                "initial_inquiry": "How much does a dental implant cost? I lost a tooth recently.",
-                "status": LeadStatus.AT_RISK,
-                "risk_level": LeadRiskLevel.MEDIUM,
-                "messages": [
-                    ("lead", "How much does a dental implant cost? I lost a tooth recently.", 0),
-                    ("ai", "I'm sorry to hear about your tooth loss, Michael. Dental implants are an excellent long-term solution. The cost varies based on your specific needs, but I can create a personalized estimate for you. Would that be helpful?", 15),
-                    ("lead", "That's pretty expensive... I need to think about this.", 1440),  # 24 hours later
-                    ("ai", "I completely understand that it's a significant investment. Many patients feel the same way initially. Would it help to discuss our payment plan options? We also work with most insurance providers.", 30)
-                ]
-            },
-            
-            # Cold lead (no recent engagement) - moderate cold 20 days
-            {
-                "name": "Jessica Martinez",
-                "email": "jessica.martinez@email.com",
-                "phone": "555-0103", 
-                "initial_inquiry": "I'm looking for teeth whitening options. What do you offer?",
-                "status": LeadStatus.COLD,
-                "risk_level": LeadRiskLevel.HIGH,
-                "days_cold": 20,
-                "messages": [
-                    ("lead", "I'm looking for teeth whitening options. What do you offer?", 0)
-                ]
-            },
-            
-            # Cold lead (no recent engagement) - long cold 50 days
-            {
-                "name": "Mark Davis",
-                "email": "mark.davis@email.com",
-                "phone": "555-0110",
-                "initial_inquiry": "I want to compare Invisalign and braces. Which is better for adults?",
-                "status": LeadStatus.COLD,
-                "risk_level": LeadRiskLevel.MEDIUM,
-                "days_cold": 50,
-                "messages": [
-                    ("lead", "I want to compare Invisalign and braces. Which is better for adults?", 0)
-                ]
-            },
-            
-            # Converted lead
-            {
-                "name": "David Wilson",
-                "email": "david.wilson@email.com",
-                "phone": "555-0104",
-                "initial_inquiry": "I need a root canal. Can you help me?",
-                "status": LeadStatus.CONVERTED,
-                "risk_level": LeadRiskLevel.LOW,
-                "messages": [
-                    ("lead", "I need a root canal. Can you help me?", 0),
-                    ("ai", "I'm sorry you're experiencing tooth pain, David. Yes, we can definitely help with root canal treatment. Our endodontist is very experienced and gentle. Would you like to schedule a consultation?", 5),
-                    ("lead", "Yes, please. How soon can I get in?", 30),
-                    ("ai", "Let me connect you with our scheduling coordinator to find the earliest available appointment. I'll also prepare some information about what to expect.", 10),
-                    ("human", "Hi David, this is Maria from Bright Smile Clinic. I can get you in tomorrow at 2 PM for an emergency consultation. Does that work?", 45),
-                    ("lead", "Perfect! Thank you so much. I'll see you tomorrow.", 5)
-                ]
-            }
-        ]
-        
-        created_leads = []
-        
-        for scenario in lead_scenarios:
-            # Create the lead
-            lead = Lead(
-                name=scenario["name"],
-                email=scenario["email"],
-                phone=scenario["phone"],
-                initial_inquiry=scenario["initial_inquiry"],
-                status=scenario["status"],
-                risk_level=scenario["risk_level"]
-            )
-            
-            db.add(lead)
-            db.flush()  # Get the lead ID
+    # Lead scenarios with realistic inquiries and conversation patterns
+    lead_scenarios = [
+        # Active, engaged lead
+        {
+            "name": "Sarah Johnson",
+            "email": "sarah.johnson@email.com",
+            "phone": "555-0101",
+            "initial_inquiry": "Hi, I'm interested in Invisalign treatment. Can you tell me more about the process and costs?",
+            "status": LeadStatus.ACTIVE,
+            "risk_level": LeadRiskLevel.LOW,
+            "messages": [
+                ("lead", "Hi, I'm interested in Invisalign treatment. Can you tell me more about the process and costs?", 0),
+                ("ai", "Hello Sarah! I'd be happy to help you learn about Invisalign. It's a popular choice for straightening teeth discreetly. The treatment typically takes 12-18 months and uses clear aligners that are virtually invisible. Would you like me to create a personalized cost breakdown for you?", 10),
+                ("lead", "Yes, that would be great! I'm also wondering about payment plans.", 60),
+                ("ai", "Excellent! We offer flexible payment plans to make treatment affordable. Let me prepare a detailed financial explainer for you that will include payment options.", 5)
+            ]
+        },
+        
+        # Price-concerned lead (at risk)
+        {
+            "name": "Michael Chen",
+            "email": "michael.chen@email.com", 
+            "phone": "555-0102",
+            "initial_inquiry": "How much does a dental implant cost? I lost a tooth recently.",
+            "status": LeadStatus.AT_RISK,
+            "risk_level": LeadRiskLevel.MEDIUM,
+            "messages": [
+                ("lead", "How much does a dental implant cost? I lost a tooth recently.", 0),
+                ("ai", "I'm sorry to hear about your tooth loss, Michael. Dental implants are an excellent long-term solution. The cost varies based on your specific needs, but I can create a personalized estimate for you. Would that be helpful?", 15),
+                ("lead", "That's pretty expensive... I need to think about this.", 1440),  # 24 hours later
+                ("ai", "I completely understand that it's a significant investment. Many patients feel the same way initially. Would it help to discuss our payment plan options? We also work with most insurance providers.", 30)
+            ]
+        },
+        
+        # Cold lead (no recent engagement) - moderate cold 20 days
+        {
+            "name": "Jessica Martinez",
+            "email": "jessica.martinez@email.com",
+            "phone": "555-0103", 
+            "initial_inquiry": "I'm looking for teeth whitening options. What do you offer?",
+            "status": LeadStatus.COLD,
+            "risk_level": LeadRiskLevel.HIGH,
+            "days_cold": 20,
+            "messages": [
+                ("lead", "I'm looking for teeth whitening options. What do you offer?", 0)
+            ]
+        },
+        
+        # Cold lead (no recent engagement) - long cold 50 days
+        {
+            "name": "Mark Davis",
+            "email": "mark.davis@email.com",
+            "phone": "555-0110",
+            "initial_inquiry": "I want to compare Invisalign and braces. Which is better for adults?",
+            "status": LeadStatus.COLD,
+            "risk_level": LeadRiskLevel.MEDIUM,
+            "days_cold": 50,
+            "messages": [
+                ("lead", "I want to compare Invisalign and braces. Which is better for adults?", 0)
+            ]
+        },
+        
+        # Converted lead
+        {
+            "name": "David Wilson",
+            "email": "david.wilson@email.com",
+            "phone": "555-0104",
+            "initial_inquiry": "I need a root canal. Can you help me?",
+            "status": LeadStatus.CONVERTED,
+            "risk_level": LeadRiskLevel.LOW,
+            "messages": [
+                ("lead", "I need a root canal. Can you help me?", 0),
+                ("ai", "I'm sorry you're experiencing tooth pain, David. Yes, we can definitely help with root canal treatment. Our endodontist is very experienced and gentle. Would you like to schedule a consultation?", 5),
+                ("lead", "Yes, please. How soon can I get in?", 30),
+                ("ai", "Let me connect you with our scheduling coordinator to find the earliest available appointment. I'll also prepare some information about what to expect.", 10),
+                ("human", "Hi David, this is Maria from Bright Smile Clinic. I can get you in tomorrow at 2 PM for an emergency consultation. Does that work?", 45),
+                ("lead", "Perfect! Thank you so much. I'll see you tomorrow.", 5)
+            ]
+        }
+    ]
+    
+    now = datetime.now(timezone.utc)
+    lead_rows = []
+    base_times = []
+    all_messages = []
+    
+    # Score every distinct lead-authored message in one batch up front
+    lead_texts = list(dict.fromkeys(
+        content
+        for scenario in lead_scenarios
+        for sender_type, content, _ in scenario.get("messages", [])
+        if sender_type == "lead"
+    ))
+    sentiment_by_text = dict(zip(lead_texts, analyze_sentiment_batch(lead_texts)))
+    
+    for scenario in lead_scenarios:
+        # For cold leads, allow per-scenario days_cold override to ensure outreach triggers
+        if scenario["status"] == LeadStatus.COLD:
+            days_back = scenario.get("days_cold", random.randint(16, 60))
+            base_time = now - timedelta(days=days_back, hours=random.randint(1, 6))
+        else:
+            base_time = now - timedelta(days=random.randint(1, 30))
+        
+        # Work out the lead's last contact time and sentiment before inserting it
+        last_contact_at = None
+        sentiment_score = None
+        if "messages" in scenario:
+            # One pass finds the latest message offset and the lead's own message sentiments
+            last_offset = 0
+            sentiments = []
+            for sender_type, content, minutes_offset in scenario["messages"]:
+                last_offset = max(last_offset, minutes_offset)
+                if sender_type == "lead":
+                    sentiments.append(sentiment_by_text[content])
             
-            # Create messages if any
-            if "messages" in scenario:
-                # For cold leads, allow per-scenario days_cold override to ensure outreach triggers
-                if scenario["status"] == LeadStatus.COLD:
-                    days_back = scenario.get("days_cold", fake.random_int(16, 60))
-                    base_time = datetime.now(timezone.utc) - timedelta(days=days_back, hours=fake.random_int(1, 6))
-                else:
-                    base_time = datetime.now(timezone.utc) - timedelta(days=fake.random_int(1, 30))
-                
-                for sender_type, content, minutes_offset in scenario["messages"]:
-                    message_time = base_time + timedelta(minutes=minutes_offset)
-                    
-                    # Calculate sentiment for lead messages
-                    sentiment = None
-                    if sender_type == "lead":
-                        sentiment = analyze_sentiment(content)
-                    
-                    message = Message(
-                        lead_id=lead.id,
-                        sender=SenderType.LEAD if sender_type == "lead" else 
-                               SenderType.AI if sender_type == "ai" else SenderType.HUMAN,
-                        content=content,
-                        created_at=message_time
-                    )
-                    
-                    db.add(message)
-                
-                # Update lead's last contact time and sentiment
-                # For cold leads, last_contact_at should be the base_time (old)
-                # For other leads, it can be more recent
-                if scenario["status"] == LeadStatus.COLD:
-                    # Cold leads: last_contact_at should be the base_time (old)
-                    lead.last_contact_at = base_time
-                else:
-                    # Other leads: last_contact_at can be more recent
-                    lead.last_contact_at = base_time + timedelta(minutes=max(msg[2] for msg in scenario["messages"]))
-                
-                # Calculate average sentiment for the lead
-                lead_messages = [msg for msg in scenario["messages"] if msg[0] == "lead"]
-                if lead_messages:
-                    sentiments = [analyze_sentiment(msg[1]) for msg in lead_messages]
-                    lead.sentiment_score = sum(sentiments) / len(sentiments)
+            # For cold leads, last_contact_at should be the base_time (old)
+            # For other leads, it can be more recent
+            if scenario["status"] == LeadStatus.COLD:
+                last_contact_at = base_time
+            else:
+                last_contact_at = base_time + timedelta(minutes=last_offset)
             
-            created_leads.append(lead)
-        
-        db.commit()
-        
-        print(f"✅ Created {len(created_leads)} sample leads successfully!")
-        
-        # Print summary
-        status_counts = {}
-        for lead in created_leads:
-            status = lead.status.value
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
-        print("\n📊 Lead Status Distribution:")
-        for status, count in status_counts.items():
-            print(f"  {status.title()}: {count}")
-        
-        return created_leads
-        
-    except Exception as e:
-        print(f"❌ Error creating sample leads: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+            # Calculate average sentiment over the lead's own messages
+            if sentiments:
+                sentiment_score = sum(sentiments) / len(sentiments)
+        
+        lead_rows.append({
+            "name": scenario["name"],
+            "email": scenario["email"],
+            "phone": scenario["phone"],
+            "initial_inquiry": scenario["initial_inquiry"],
+            "status": scenario["status"],
+            "risk_level": scenario["risk_level"],
+            "last_contact_at": last_contact_at,
+            "sentiment_score": sentiment_score
+        })
+        base_times.append(base_time)
+    
+    # Insert every lead in one statement, getting the rows (and their ids) back in scenario order
+    created_leads = db.scalars(
+        insert(Lead).returning(Lead, sort_by_parameter_order=True),
+        lead_rows
+    ).all()
+    
+    # Build the conversations against the new ids; all leads' messages are inserted together
+    for lead, scenario, base_time in zip(created_leads, lead_scenarios, base_times):
+        for sender_type, content, minutes_offset in scenario.get("messages", []):
+            all_messages.append({
+                "lead_id": lead.id,
+                "sender": SENDER_TYPES[sender_type],
+                "content": content,
+                "created_at": base_time + timedelta(minutes=minutes_offset)
+            })
+    
+    if all_messages:
+        db.execute(insert(Message), all_messages)
+    
+    logger.info(f"✅ Created {len(created_leads)} sample leads successfully!")
+    
+    # Print summary
+    status_counts = Counter(lead.status.value for lead in created_leads)
+    
+    logger.info("\n📊 Lead Status Distribution:")
+    for status, count in status_counts.most_common():
+        logger.info(f"  {status.title()}: {count}")
+    
+    return created_leads
 
 
-def create_financial_explainers(leads):
+def create_financial_explainers(db, leads):
     """Create financial explainers for leads"""
     
-    db = SessionLocal()
+    logger.info("💰 Creating financial explainers...")
     
-    try:
-        print("💰 Creating financial explainers...")
-        
-        created_explainers = []
-        
-        for lead in leads:
-            if lead.status in [LeadStatus.ACTIVE, LeadStatus.CONVERTED]:
-                # Create financial explainer for active/converted leads
-                explainer = FinancialExplainer(
-                    lead_id=lead.id,
-                    secure_url_token=f"token_{lead.id}_{fake.uuid4()[:8]}",
-                    is_accessed=fake.random.choice([True, False]),
-                    access_count=fake.random_int(0, 5),
-                    first_accessed_at=fake.date_time_between(start_date='-30d', end_date='now') if fake.random.choice([True, False]) else None,
-                    last_accessed_at=fake.date_time_between(start_date='-7d', end_date='now') if fake.random.choice([True, False]) else None,
-                    procedure_name=fake.random.choice([
-                        "Invisalign Treatment", "Dental Implant", "Root Canal", 
-                        "Teeth Whitening", "Dental Crown", "Comprehensive Exam"
-                    ]),
-                    total_cost=Decimal(str(fake.random.uniform(1500, 8000))),
-                    estimated_insurance=Decimal(str(fake.random.uniform(500, 3000))) if fake.random.choice([True, False]) else None,
-                    out_of_pocket_cost=Decimal(str(fake.random.uniform(800, 5000))),
-                    payment_options={
-                        "monthly_plan": {"months": 12, "monthly_payment": str(Decimal(str(fake.random.uniform(100, 400))))},
-                        "quarterly_plan": {"months": 6, "quarterly_payment": str(Decimal(str(fake.random.uniform(300, 1200))))},
-                        "insurance_coverage": fake.random.choice([True, False])
-                    }
-                )
-                
-                db.add(explainer)
-                created_explainers.append(explainer)
-        
-        db.commit()
-        
-        print(f"✅ Created {len(created_explainers)} financial explainers successfully!")
-        
-        return created_explainers
-        
-    except Exception as e:
-        print(f"❌ Error creating financial explainers: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    fake = get_fake()
+    now = datetime.now(timezone.utc)
+    
+    created_explainers = []
+    
+    for lead in leads:
+        if lead.status in [LeadStatus.ACTIVE, LeadStatus.CONVERTED]:
+            # Create financial explainer rows for active/converted leads
+            created_explainers.append({
+                "lead_id": lead.id,
+                "secure_url_token": f"token_{lead.id}_{fake.uuid4()[:8]}",
+                "is_accessed": random.choice([True, False]),
+                "access_count": random.randint(0, 5),
+                "first_accessed_at": random_time_within(now, 30) if random.choice([True, False]) else None,
+                "last_accessed_at": random_time_within(now, 7) if random.choice([True, False]) else None,
+                "procedure_name": random.choice([
+                    "Invisalign Treatment", "Dental Implant", "Root Canal", 
+                    "Teeth Whitening", "Dental Crown", "Comprehensive Exam"
+                ]),
+                "total_cost": Decimal(str(random.uniform(1500, 8000))),
+                "estimated_insurance": Decimal(str(random.uniform(500, 3000))) if random.choice([True, False]) else None,
+                "out_of_pocket_cost": Decimal(str(random.uniform(800, 5000))),
+                "payment_options": {
+                    "monthly_plan": {"months": 12, "monthly_payment": str(Decimal(str(random.uniform(100, 400))))},
+                    "quarterly_plan": {"months": 6, "quarterly_payment": str(Decimal(str(random.uniform(300, 1200))))},
+                    "insurance_coverage": random.choice([True, False])
+                }
+            })
+    
+    if created_explainers:
+        db.execute(insert(FinancialExplainer), created_explainers)
+    
+    logger.info(f"✅ Created {len(created_explainers)} financial explainers successfully!")
+    
+    return created_explainers
 
 
-def create_system_events(leads):
+def create_system_events(db, leads):
     """Create system events for leads"""
     
-    db = SessionLocal()
+    logger.info("📊 Creating system events...")
     
-    try:
-        print("📊 Creating system events...")
-        
-        created_events = []
-        
-        event_types = [
-            "lead_created", "message_sent", "ai_response_generated", 
-            "financial_explainer_created", "lead_status_updated", 
-            "risk_assessment_completed", "sentiment_analyzed"
-        ]
-        
-        for lead in leads:
-            # Create multiple events per lead
-            for _ in range(fake.random_int(2, 5)):
-                event = SystemEvent(
-                    lead_id=lead.id,
-                    event_type=fake.random.choice(event_types),
-                    details=f"Event for lead {lead.name} - {fake.sentence()}",
-                    severity=fake.random.choice(["info", "warning", "error"]),
-                    processed=fake.random.choice([True, False]),
-                    created_at=fake.date_time_between(start_date='-30d', end_date='now')
-                )
-                
-                db.add(event)
-                created_events.append(event)
-        
-        db.commit()
-        
-        print(f"✅ Created {len(created_events)} system events successfully!")
-        
-        return created_events
-        
-    except Exception as e:
-        print(f"❌ Error creating system events: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    fake = get_fake()
+    now = datetime.now(timezone.utc)
+    
+    created_events = []
+    
+    event_types = [
+        "lead_created", "message_sent", "ai_response_generated", 
+        "financial_explainer_created", "lead_status_updated", 
+        "risk_assessment_completed", "sentiment_analyzed"
+    ]
+    
+    # Create multiple events per lead, rolling the categorical columns in one pass
+    event_leads = [lead for lead in leads for _ in range(random.randint(2, 5))]
+    event_count = len(event_leads)
+    rolled_types = random.choices(event_types, k=event_count)
+    rolled_severities = random.choices(["info", "warning", "error"], k=event_count)
+    rolled_processed = random.choices([True, False], k=event_count)
+    
+    for lead, event_type, severity, processed in zip(
+        event_leads, rolled_types, rolled_severities, rolled_processed
+    ):
+        created_events.append({
+            "lead_id": lead.id,
+            "event_type": event_type,
+            "category": event_type.split("_", 1)[0],
+            "details": f"Event for lead {lead.name} - {fake.sentence()}",
+            "severity": severity,
+            "processed": processed,
+            "created_at": random_time_within(now, 30)
+        })
+    
+    if created_events:
+        db.execute(insert(SystemEvent), created_events)
+    
+    logger.info(f"✅ Created {len(created_events)} system events successfully!")
+    
+    return created_events
 
 
-def create_ai_interactions(leads):
+def create_ai_interactions(db, leads):
     """Create AI interaction records for leads"""
     
-    db = SessionLocal()
+    logger.info("🤖 Creating AI interaction records...")
     
-    try:
-        print("🤖 Creating AI interaction records...")
-        
-        created_interactions = []
-        
-        interaction_types = ["instant_reply", "proactive_outreach", "sentiment_analysis", "risk_assessment"]
-        models_used = ["gpt-4", "gpt-3.5-turbo", "claude-3", "gemini-pro"]
-        
-        for lead in leads:
-            # Create multiple AI interactions per lead
-            for _ in range(fake.random_int(1, 3)):
-                interaction = AIInteraction(
-                    lead_id=lead.id,
-                    interaction_type=fake.random.choice(interaction_types),
-                    model_used=fake.random.choice(models_used),
-                    prompt_tokens=fake.random_int(100, 500),
-                    completion_tokens=fake.random_int(50, 200),
-                    total_cost=Decimal(str(fake.random.uniform(0.01, 0.50))),
-                    response_time_ms=fake.random_int(500, 3000),
-                    success=fake.random.choice([True, True, True, False]),  # Mostly successful
-                    error_message=fake.sentence() if fake.random.choice([True, False]) else None,
-                    created_at=fake.date_time_between(start_date='-30d', end_date='now')
-                )
-                
-                db.add(interaction)
-                created_interactions.append(interaction)
-        
-        db.commit()
-        
-        print(f"✅ Created {len(created_interactions)} AI interaction records successfully!")
-        
-        return created_interactions
-        
-    except Exception as e:
-        print(f"❌ Error creating AI interactions: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    fake = get_fake()
+    now = datetime.now(timezone.utc)
+    
+    created_interactions = []
+    
+    interaction_types = ["instant_reply", "proactive_outreach", "sentiment_analysis", "risk_assessment"]
+    models_used = ["gpt-4", "gpt-3.5-turbo", "claude-3", "gemini-pro"]
+    
+    # Create multiple AI interactions per lead, rolling the categorical columns in one pass
+    interaction_leads = [lead for lead in leads for _ in range(random.randint(1, 3))]
+    interaction_count = len(interaction_leads)
+    rolled_types = random.choices(interaction_types, k=interaction_count)
+    rolled_models = random.choices(models_used, k=interaction_count)
+    rolled_success = random.choices([True, False], weights=[3, 1], k=interaction_count)  # Mostly successful
+    rolled_has_error = random.choices([True, False], k=interaction_count)
+    
+    for lead, interaction_type, model_used, success, has_error in zip(
+        interaction_leads, rolled_types, rolled_models, rolled_success, rolled_has_error
+    ):
+        created_interactions.append({
+            "lead_id": lead.id,
+            "interaction_type": interaction_type,
+            "model_used": model_used,
+            "prompt_tokens": random.randint(100, 500),
+            "completion_tokens": random.randint(50, 200),
+            "total_cost": Decimal(str(random.uniform(0.01, 0.50))),
+            "response_time_ms": random.randint(500, 3000),
+            "success": success,
+            "error_message": fake.sentence() if has_error else None,
+            "created_at": random_time_within(now, 30)
+        })
+    
+    if created_interactions:
+        db.execute(insert(AIInteraction), created_interactions)
+    
+    logger.info(f"✅ Created {len(created_interactions)} AI interaction records successfully!")
+    
+    return created_interactions
 
 
-def create_lead_scores(leads):
+def create_lead_scores(db, leads):
     """Create lead scoring records"""
     
-    db = SessionLocal()
+    logger.info("📈 Creating lead scores...")
     
-    try:
-        print("📈 Creating lead scores...")
-        
-        created_scores = []
-        
-        for lead in leads:
-            # Generate realistic scores based on lead status
-            if lead.status == LeadStatus.CONVERTED:
-                engagement_score = fake.random.uniform(0.8, 1.0)
-                intent_score = fake.random.uniform(0.9, 1.0)
-                urgency_score = fake.random.uniform(0.7, 1.0)
-                budget_score = fake.random.uniform(0.6, 1.0)
-            elif lead.status == LeadStatus.ACTIVE:
-                engagement_score = fake.random.uniform(0.6, 0.9)
-                intent_score = fake.random.uniform(0.7, 0.9)
-                urgency_score = fake.random.uniform(0.5, 0.8)
-                budget_score = fake.random.uniform(0.5, 0.8)
-            elif lead.status == LeadStatus.AT_RISK:
-                engagement_score = fake.random.uniform(0.3, 0.6)
-                intent_score = fake.random.uniform(0.4, 0.7)
-                urgency_score = fake.random.uniform(0.6, 0.9)
-                budget_score = fake.random.uniform(0.2, 0.5)
-            else:  # NEW, COLD, etc.
-                engagement_score = fake.random.uniform(0.1, 0.5)
-                intent_score = fake.random.uniform(0.2, 0.6)
-                urgency_score = fake.random.uniform(0.3, 0.7)
-                budget_score = fake.random.uniform(0.3, 0.7)
-            
-            total_score = (engagement_score + intent_score + urgency_score + budget_score) / 4
-            
-            score = LeadScore(
-                lead_id=lead.id,
-                engagement_score=engagement_score,
-                intent_score=intent_score,
-                urgency_score=urgency_score,
-                budget_score=budget_score,
-                total_score=total_score,
-                score_updated_at=datetime.now(timezone.utc)
-            )
-            
-            db.add(score)
-            created_scores.append(score)
-        
-        db.commit()
-        
-        print(f"✅ Created {len(created_scores)} lead scores successfully!")
-        
-        return created_scores
-        
-    except Exception as e:
-        print(f"❌ Error creating lead scores: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    now = datetime.now(timezone.utc)
+    created_scores = []
+    
+    for lead in leads:
+        # Generate realistic scores based on lead status
+        score_ranges = LEAD_SCORE_RANGES.get(lead.status, DEFAULT_LEAD_SCORE_RANGES)
+        engagement_score, intent_score, urgency_score, budget_score = (
+            random.uniform(low, high) for low, high in score_ranges
+        )
+        
+        created_scores.append({
+            "lead_id": lead.id,
+            "engagement_score": engagement_score,
+            "intent_score": intent_score,
+            "urgency_score": urgency_score,
+            "budget_score": budget_score,
+            "total_score": (engagement_score + intent_score + urgency_score + budget_score) / 4,
+            "score_updated_at": now
+        })
+    
+    if created_scores:
+        db.execute(insert(LeadScore), created_scores)
+    
+    logger.info(f"✅ Created {len(created_scores)} lead scores successfully!")
+    
+    return created_scores
 
 
 def main():
     """Run comprehensive database seeding"""
     
-    print("🌱 Starting comprehensive database seeding...")
-    print("=" * 60)
+    logger.info("🌱 Starting comprehensive database seeding...")
+    logger.info("=" * 60)
     
     try:
-        # Step 1: Clear the database
-        clear_database()
-        
-        # Step 2: Create offers and testimonials first (referenced by other entities)
-        print("\n1️⃣ Creating offers and testimonials...")
-        offers = create_sample_offers()
-        testimonials = create_sample_testimonials()
-        
-        # Step 3: Create leads with messages
-        print("\n2️⃣ Creating sample leads and conversations...")
-        leads = create_sample_leads()
-        
-        # Step 4: Create financial explainers
-        print("\n3️⃣ Creating financial explainers...")
-        financial_explainers = create_financial_explainers(leads)
-        
-        # Step 5: Create system events
-        print("\n4️⃣ Creating system events...")
-        system_events = create_system_events(leads)
-        
-        # Step 6: Create AI interactions
-        print("\n5️⃣ Creating AI interaction records...")
-        ai_interactions = create_ai_interactions(leads)
-        
-        # Step 7: Create lead scores
-        print("\n6️⃣ Creating lead scores...")
-        lead_scores = create_lead_scores(leads)
+        # Step 1: Clear the database (pass --recreate to rebuild the tables from the models)
+        clear_database(recreate="--recreate" in sys.argv)
+        
+        # Seed everything in one transaction so a single commit persists it all
+        with SeedSessionLocal() as db, db.begin():
+            # Step 2: Create offers and testimonials first (referenced by other entities)
+            logger.info("\n1️⃣ Creating offers and testimonials...")
+            offers = create_sample_offers(db)
+            testimonials = create_sample_testimonials(db)
+            
+            # Step 3: Create leads with messages
+            logger.info("\n2️⃣ Creating sample leads and conversations...")
+            leads = create_sample_leads(db)
+            
+            # Step 4: Create financial explainers
+            logger.info("\n3️⃣ Creating financial explainers...")
+            financial_explainers = create_financial_explainers(db, leads)
+            
+            # Step 5: Create system events
+            logger.info("\n4️⃣ Creating system events...")
+            system_events = create_system_events(db, leads)
+            
+            # Step 6: Create AI interactions
+            logger.info("\n5️⃣ Creating AI interaction records...")
+            ai_interactions = create_ai_interactions(db, leads)
+            
+            # Step 7: Create lead scores
+            logger.info("\n6️⃣ Creating lead scores...")
+            lead_scores = create_lead_scores(db, leads)
         
         # Summary
-        print("\n" + "=" * 60)
-        print("🎉 DATABASE SEEDING COMPLETED SUCCESSFULLY!")
-        print("=" * 60)
-        print(f"✅ {len(offers)} offers created")
-        print(f"✅ {len(testimonials)} testimonials created") 
-        print(f"✅ {len(leads)} leads created")
-        print(f"✅ {len(financial_explainers)} financial explainers created")
-        print(f"✅ {len(system_events)} system events created")
-        print(f"✅ {len(ai_interactions)} AI interactions created")
-        print(f"✅ {len(lead_scores)} lead scores created")
-        
-        print("\n📋 Next Steps:")
-        print("1. Start the application: python -m app.main")
-        print("2. Visit the API docs: http://localhost:8000/docs")
-        print("3. Check the dashboard: http://localhost:8000/api/v1/dashboard/overview")
-        print("4. Test AI responses: POST to /api/v1/messages/from-lead")
-        
-        print("\n🧪 Test Scenarios Available:")
-        print("- Active engaged leads (Sarah Johnson)")
-        print("- At-risk leads (Michael Chen)")
-        print("- Cold leads (Jessica Martinez)")
-        print("- Converted leads (David Wilson)")
-        print("- New leads (Emily Thompson)")
-        
-        print("\n🔧 AI Features Ready for Testing:")
-        print("- Sentiment analysis on lead messages")
-        print("- Risk assessment and scoring")
-        print("- Financial explainer generation")
-        print("- Proactive outreach triggers")
-        print("- Conversation history tracking")
+        logger.info("\n" + "=" * 60)
+        logger.info("🎉 DATABASE SEEDING COMPLETED SUCCESSFULLY!")
+        logger.info("=" * 60)
+        logger.info(f"✅ {len(offers)} offers created")
+        logger.info(f"✅ {len(testimonials)} testimonials created") 
+        logger.info(f"✅ {len(leads)} leads created")
+        logger.info(f"✅ {len(financial_explainers)} financial explainers created")
+        logger.info(f"✅ {len(system_events)} system events created")
+        logger.info(f"✅ {len(ai_interactions)} AI interactions created")
+        logger.info(f"✅ {len(lead_scores)} lead scores created")
+        
+        logger.info("\n📋 Next Steps:")
+        logger.info("1. Start the application: python -m app.main")
+        logger.info("2. Visit the API docs: http://localhost:8000/docs")
+        logger.info("3. Check the dashboard: http://localhost:8000/api/v1/dashboard/overview")
+        logger.info("4. Test AI responses: POST to /api/v1/messages/from-lead")
+        
+        logger.info("\n🧪 Test Scenarios Available:")
+        logger.info("- Active engaged leads (Sarah Johnson)")
+        logger.info("- At-risk leads (Michael Chen)")
+        logger.info("- Cold leads (Jessica Martinez)")
+        logger.info("- Converted leads (David Wilson)")
+        logger.info("- New leads (Emily Thompson)")
+        
+        logger.info("\n🔧 AI Features Ready for Testing:")
+        logger.info("- Sentiment analysis on lead messages")
+        logger.info("- Risk assessment and scoring")
+        logger.info("- Financial explainer generation")
+        logger.info("- Proactive outreach triggers")
+        logger.info("- Conversation history tracking")
         
     except Exception as e:
-        print(f"\n❌ SEEDING FAILED: {e}")
-        print("Check your database connection and try again.")
+        logger.error(f"\n❌ SEEDING FAILED: {e}")
+        logger.info("Check your database connection and try again.")
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main() 
\ No newline at end of file
@@ -3,238 +3,266 @@ Seed script for creating sample leads and messages
 """
 import sys
 import os
+import random
+from collections import Counter
 from datetime import datetime, timedelta, timezone
-from faker import Faker
+from sqlalchemy import insert
 
 # Add the parent directory to the path so we can import our app modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.db.base import SessionLocal
-from app.db.models import Lead, Message, LeadStatus, LeadRiskLevel, SenderType
-from app.core.utils import analyze_sentiment
+from app.db.models import Lead, Message, LeadStatus, LeadRiskLevel
+from app.core.utils import analyze_sentiment_batch
+from scripts.seed_utils import SENDER_TYPES, SeedSessionLocal, get_fake, random_time_within
 
-fake = Faker()
+# Lead scenarios with realistic inquiries and conversation patterns
+LEAD_SCENARIOS = (
+    # Active, engaged lead
+    {
+        "name": "Sarah Johnson",
+        "email": "sarah.johnson@email.com",
+        "phone": "555-0101",
+        "initial_inquiry": "Hi, I'm interested in Invisalign treatment. Can you tell me more about the process and costs?",
+        "status": LeadStatus.ACTIVE,
+        "risk_level": LeadRiskLevel.LOW,
+        "messages": [
+            ("lead", "Hi, I'm interested in Invisalign treatment. Can you tell me more about the process and costs?", 0),
+            ("ai", "Hello Sarah! I'd be happy to help you learn about Invisalign. It's a popular choice for straightening teeth discreetly. The treatment typically takes 12-18 months and uses clear aligners that are virtually invisible. Would you like me to create a personalized cost breakdown for you?", 10),
+            ("lead", "Yes, that would be great! I'm also wondering about payment plans.", 60),
+            ("ai", "Excellent! We offer flexible payment plans to make treatment affordable. Let me prepare a detailed financial explainer for you that will include payment options.", 5)
+        ]
+    },
+    
+    # Price-concerned lead (at risk)
+    {
+        "name": "Michael Chen",
+        "email": "michael.chen@email.com", 
+        "phone": "555-0102",
+        "initial_inquiry": "How much does a dental implant cost? I lost a tooth recently.",
+        "status": LeadStatus.AT_RISK,
+        "risk_level": LeadRiskLevel.MEDIUM,
+        "messages": [
+            ("lead", "How much does a dental implant cost? I lost a tooth recently.", 0),
+            ("ai", "I'm sorry to hear about your tooth loss, Michael. Dental implants are an excellent long-term solution. The cost varies based on your specific needs, but I can create a personalized estimate for you. Would that be helpful?", 15),
+            ("lead", "That's pretty expensive... I need to think about this.", 1440),  # 24 hours later
+            ("ai", "I completely understand that it's a significant investment. Many patients feel the same way initially. Would it help to discuss our payment plan options? We also work with most insurance providers.", 30)
+        ]
+    },
+    
+    # Cold lead (no recent engagement)
+    {
+        "name": "Jessica Martinez",
+        "email": "jessica.martinez@email.com",
+        "phone": "555-0103", 
+        "initial_inquiry": "I'm looking for teeth whitening options. What do you offer?",
+        "status": LeadStatus.COLD,
+        "risk_level": LeadRiskLevel.HIGH,
+        "messages": [
+            ("lead", "I'm looking for teeth whitening options. What do you offer?", 0),
+            ("ai", "Hi Jessica! We offer professional teeth whitening that can brighten your smile by 3-8 shades in just one visit. We also have take-home options for gradual whitening. Would you like to know more about either option?", 20),
+            ("lead", "Sounds interesting, let me check my schedule.", 2880),  # 48 hours later
+            ("ai", "No problem at all! Take your time. When you're ready, I'm here to answer any questions about our whitening treatments or help schedule a consultation.", 60)
+        ]
+    },
+    
+    # Converted lead
+    {
+        "name": "David Wilson",
+        "email": "david.wilson@email.com",
+        "phone": "555-0104",
+        "initial_inquiry": "I need a root canal. Can you help me?",
+        "status": LeadStatus.CONVERTED,
+        "risk_level": LeadRiskLevel.LOW,
+        "messages": [
+            ("lead", "I need a root canal. Can you help me?", 0),
+            ("ai", "I'm sorry you're experiencing tooth pain, David. Yes, we can definitely help with root canal treatment. Our endodontist is very experienced and gentle. Would you like to schedule a consultation?", 5),
+            ("lead", "Yes, please. How soon can I get in?", 30),
+            ("ai", "Let me connect you with our scheduling coordinator to find the earliest available appointment. I'll also prepare some information about what to expect.", 10),
+            ("human", "Hi David, this is Maria from Bright Smile Clinic. I can get you in tomorrow at 2 PM for an emergency consultation. Does that work?", 45),
+            ("lead", "Perfect! Thank you so much. I'll see you tomorrow.", 5)
+        ]
+    },
+    
+    # New lead (just arrived)
+    {
+        "name": "Emily Thompson", 
+        "email": "emily.thompson@email.com",
+        "phone": "555-0105",
+        "initial_inquiry": "Do you take new patients? I need a cleaning and checkup.",
+        "status": LeadStatus.NEW,
+        "risk_level": LeadRiskLevel.LOW,
+        "messages": [
+            ("lead", "Do you take new patients? I need a cleaning and checkup.", 5)
+        ]
+    },
+    
+    # Anxious patient (high risk)
+    {
+        "name": "Robert Kim",
+        "email": "robert.kim@email.com",
+        "phone": "555-0106",
+        "initial_inquiry": "I'm really nervous about dental work but I think I need some fillings.",
+        "status": LeadStatus.AT_RISK,
+        "risk_level": LeadRiskLevel.HIGH,
+        "messages": [
+            ("lead", "I'm really nervous about dental work but I think I need some fillings.", 0),
+            ("ai", "Thank you for reaching out, Robert. I completely understand dental anxiety - you're not alone in feeling this way. We specialize in gentle, comfortable care and offer several options to help anxious patients feel at ease. Would you like to know more about our comfort options?", 15),
+            ("lead", "I guess... but I'm really scared of the pain. I've had bad experiences before.", 120),
+            ("ai", "I'm so sorry you've had difficult experiences. That fear is completely valid. We use the latest pain management techniques, and many anxious patients are surprised at how comfortable they feel. We can also discuss sedation options if that would help. Would you like to speak with one of our patient coordinators about your concerns?", 30),
+            ("lead", "Maybe... I don't know. This is really hard for me.", 720)  # 12 hours later
+        ]
+    },
+    
+    # Price shopper (comparing options)
+    {
+        "name": "Lisa Rodriguez",
+        "email": "lisa.rodriguez@email.com", 
+        "phone": "555-0107",
+        "initial_inquiry": "I'm getting quotes for crowns. What's your pricing?",
+        "status": LeadStatus.ACTIVE,
+        "risk_level": LeadRiskLevel.MEDIUM,
+        "messages": [
+            ("lead", "I'm getting quotes for crowns. What's your pricing?", 0),
+            ("ai", "Hi Lisa! Crown pricing depends on the type of crown and your specific needs. We offer porcelain, ceramic, and gold options. I'd be happy to create a personalized cost breakdown for you. What type of crown restoration are you considering?", 25),
+            ("lead", "I need two crowns on my back teeth. I'm comparing prices at different offices.", 90),
+            ("ai", "That makes perfect sense - it's smart to compare options for such an important investment. Beyond pricing, I'd love to tell you about our advanced crown technology and lifetime warranty. May I create a detailed comparison sheet showing our value proposition?", 45)
+        ]
+    }
+)
+
+RANDOM_LEAD_COUNT = 20
+
+RANDOM_LEAD_INQUIRIES = (
+    "I'm interested in dental cleaning",
+    "Do you do emergency appointments?",
+    "I need information about braces",
+    "What are your office hours?",
+    "I'm looking for a new dentist",
+    "Can you help with tooth pain?",
+    "I want to whiten my teeth",
+    "Do you accept my insurance?",
+    "I need a filling replaced",
+    "Tell me about your services"
+)
+
+RANDOM_LEAD_STATUSES = (LeadStatus.NEW, LeadStatus.ACTIVE, LeadStatus.COLD, LeadStatus.CONVERTED)
+
+RANDOM_LEAD_RISK_LEVELS = (LeadRiskLevel.LOW, LeadRiskLevel.MEDIUM, LeadRiskLevel.HIGH)
 
 
 def create_sample_leads():
     """Create diverse sample leads with realistic data"""
     
-    db = SessionLocal()
+    db = SeedSessionLocal()
     
     try:
         print("🌱 Creating sample leads...")
         
-        # Lead scenarios with realistic inquiries and conversation patterns
-        lead_scenarios = [
-            # Active, engaged lead
-            {
-                "name": "Sarah Johnson",
-                "email": "sarah.johnson@email.com",
-                "phone": "555-0101",
-                "initial_inquiry": "Hi, I'm interested in Invisalign treatment. Can you tell me more about the process and costs?",
-                "status": LeadStatus.ACTIVE,
-                "risk_level": LeadRiskLevel.LOW,
-                "messages": [
-                    ("lead", "Hi, I'm interested in Invisalign treatment. Can you tell me more about the process and costs?", 0),
-                    ("ai", "Hello Sarah! I'd be happy to help you learn about Invisalign. It's a popular choice for straightening teeth discreetly. The treatment typically takes 12-18 months and uses clear aligners that are virtually invisible. Would you like me to create a personalized cost breakdown for you?", 10),
-                    ("lead", "Yes, that would be great! I'm also wondering about payment plans.", 60),
-                    ("ai", "Excellent! We offer flexible payment plans to make treatment affordable. Let me prepare a detailed financial explainer for you that will include payment options.", 5)
-                ]
-            },
-            
-            # Price-concerned lead (at risk)
-            {
-                "name": "Michael Chen",
-                "email": "michael.chen@email.com", 
-                "phone": "555-0102",
-                "initial_inquiry": "How much does a dental implant cost? I lost a tooth recently.",
-                "status": LeadStatus.AT_RISK,
-                "risk_level": LeadRiskLevel.MEDIUM,
-                "messages": [
-                    ("lead", "How much does a dental implant cost? I lost a tooth recently.", 0),
-                    ("ai", "I'm sorry to hear about your tooth loss, Michael. Dental implants are an excellent long-term solution. The cost varies based on your specific needs, but I can create a personalized estimate for you. Would that be helpful?", 15),
-                    ("lead", "That's pretty expensive... I need to think about this.", 1440),  # 24 hours later
-                    ("ai", "I completely understand that it's a significant investment. Many patients feel the same way initially. Would it help to discuss our payment plan options? We also work with most insurance providers.", 30)
-                ]
-            },
-            
-            # Cold lead (no recent engagement)
-            {
-                "name": "Jessica Martinez",
-                "email": "jessica.martinez@email.com",
-                "phone": "555-0103", 
-                "initial_inquiry": "I'm looking for teeth whitening options. What do you offer?",
-                "status": LeadStatus.COLD,
-                "risk_level": LeadRiskLevel.HIGH,
-                "messages": [
-                    ("lead", "I'm looking for teeth whitening options. What do you offer?", 0),
-                    ("ai", "Hi Jessica! We offer professional teeth whitening that can brighten your smile by 3-8 shades in just one visit. We also have take-home options for gradual whitening. Would you like to know more about either option?", 20),
-                    ("lead", "Sounds interesting, let me check my schedule.", 2880),  # 48 hours later
-                    ("ai", "No problem at all! Take your time. When you're ready, I'm here to answer any questions about our whitening treatments or help schedule a consultation.", 60)
-                ]
-            },
-            
-            # Converted lead
-            {
-                "name": "David Wilson",
-                "email": "david.wilson@email.com",
-                "phone": "555-0104",
-                "initial_inquiry": "I need a root canal. Can you help me?",
-                "status": LeadStatus.CONVERTED,
-                "risk_level": LeadRiskLevel.LOW,
-                "messages": [
-                    ("lead", "I need a root canal. Can you help me?", 0),
-                    ("ai", "I'm sorry you're experiencing tooth pain, David. Yes, we can definitely help with root canal treatment. Our endodontist is very experienced and gentle. Would you like to schedule a consultation?", 5),
-                    ("lead", "Yes, please. How soon can I get in?", 30),
-                    ("ai", "Let me connect you with our scheduling coordinator to find the earliest available appointment. I'll also prepare some information about what to expect.", 10),
-                    ("human", "Hi David, this is Maria from Bright Smile Clinic. I can get you in tomorrow at 2 PM for an emergency consultation. Does that work?", 45),
-                    ("lead", "Perfect! Thank you so much. I'll see you tomorrow.", 5)
-                ]
-            },
-            
-            # New lead (just arrived)
-            {
-                "name": "Emily Thompson", 
-                "email": "emily.thompson@email.com",
-                "phone": "555-0105",
-                "initial_inquiry": "Do you take new patients? I need a cleaning and checkup.",
-                "status": LeadStatus.NEW,
-                "risk_level": LeadRiskLevel.LOW,
-                "messages": [
-                    ("lead", "Do you take new patients? I need a cleaning and checkup.", 5)
-                ]
-            },
-            
-            # Anxious patient (high risk)
-            {
-                "name": "Robert Kim",
-                "email": "robert.kim@email.com",
-                "phone": "555-0106",
-                "initial_inquiry": "I'm really nervous about dental work but I think I need some fillings.",
-                "status": LeadStatus.AT_RISK,
-                "risk_level": LeadRiskLevel.HIGH,
-                "messages": [
-                    ("lead", "I'm really nervous about dental work but I think I need some fillings.", 0),
-                    ("ai", "Thank you for reaching out, Robert. I completely understand dental anxiety - you're not alone in feeling this way. We specialize in gentle, comfortable care and offer several options to help anxious patients feel at ease. Would you like to know more about our comfort options?", 15),
-                    ("lead", "I guess... but I'm really scared of the pain. I've had bad experiences before.", 120),
-                    ("ai", "I'm so sorry you've had difficult experiences. That fear is completely valid. We use the latest pain management techniques, and many anxious patients are surprised at how comfortable they feel. We can also discuss sedation options if that would help. Would you like to speak with one of our patient coordinators about your concerns?", 30),
-                    ("lead", "Maybe... I don't know. This is really hard for me.", 720)  # 12 hours later
-                ]
-            },
-            
-            # Price shopper (comparing options)
-            {
-                "name": "Lisa Rodriguez",
-                "email": "lisa.rodriguez@email.com", 
-                "phone": "555-0107",
-                "initial_inquiry": "I'm getting quotes for crowns. What's your pricing?",
-                "status": LeadStatus.ACTIVE,
-                "risk_level": LeadRiskLevel.MEDIUM,
-                "messages": [
-                    ("lead", "I'm getting quotes for crowns. What's your pricing?", 0),
-                    ("ai", "Hi Lisa! Crown pricing depends on the type of crown and your specific needs. We offer porcelain, ceramic, and gold options. I'd be happy to create a personalized cost breakdown for you. What type of crown restoration are you considering?", 25),
-                    ("lead", "I need two crowns on my back teeth. I'm comparing prices at different offices.", 90),
-                    ("ai", "That makes perfect sense - it's smart to compare options for such an important investment. Beyond pricing, I'd love to tell you about our advanced crown technology and lifetime warranty. May I create a detailed comparison sheet showing our value proposition?", 45)
-                ]
-            }
-        ]
+        now = datetime.now(timezone.utc)
+        lead_rows = []
+        base_times = []
         
-        created_leads = []
-        
-        for scenario in lead_scenarios:
-            # Create the lead
-            lead = Lead(
-                name=scenario["name"],
-                email=scenario["email"],
-                phone=scenario["phone"],
-                initial_inquiry=scenario["initial_inquiry"],
-                status=scenario["status"],
-                risk_level=scenario["risk_level"]
-            )
-            
-            db.add(lead)
-            db.flush()  # Get the lead ID
+        # Score each distinct lead-authored message once, in a single batch
+        lead_texts = list(dict.fromkeys(
+            content
+            for scenario in LEAD_SCENARIOS
+            for sender_type, content, _ in scenario.get("messages", [])
+            if sender_type == "lead"
+        ))
+        sentiment_by_text = dict(zip(lead_texts, analyze_sentiment_batch(lead_texts)))
+        
+        for scenario in LEAD_SCENARIOS:
+            base_time = now - timedelta(days=random.randint(1, 30))
+            last_contact_at = None
+            sentiment_score = None
             
-            # Create messages if any
             if "messages" in scenario:
-                base_time = datetime.now(timezone.utc) - timedelta(days=fake.random_int(1, 30))
-                
+                # One pass finds the latest message offset and the lead's own message sentiments
+                last_offset = 0
+                sentiments = []
                 for sender_type, content, minutes_offset in scenario["messages"]:
-                    message_time = base_time + timedelta(minutes=minutes_offset)
-                    
-                    # Calculate sentiment for lead messages
-                    sentiment = None
+                    last_offset = max(last_offset, minutes_offset)
                     if sender_type == "lead":
-                        sentiment = analyze_sentiment(content)
-                    
-                    message = Message(
-                        lead_id=lead.id,
-                        sender=SenderType.LEAD if sender_type == "lead" else 
-                               SenderType.AI if sender_type == "ai" else SenderType.HUMAN,
-                        content=content,
-                        created_at=message_time
-                    )
-                    
-                    db.add(message)
+                        sentiments.append(sentiment_by_text[content])
                 
-                # Update lead's last contact time and sentiment
-                lead.last_contact_at = base_time + timedelta(minutes=max(msg[2] for msg in scenario["messages"]))
+                # Lead's last contact time is its latest message
+                last_contact_at = base_time + timedelta(minutes=last_offset)
                 
                 # Calculate average sentiment for the lead
-                lead_messages = [msg for msg in scenario["messages"] if msg[0] == "lead"]
-                if lead_messages:
-                    sentiments = [analyze_sentiment(msg[1]) for msg in lead_messages]
-                    lead.sentiment_score = sum(sentiments) / len(sentiments)
+                if sentiments:
+                    sentiment_score = sum(sentiments) / len(sentiments)
             
-            created_leads.append(lead)
+            lead_rows.append({
+                "name": scenario["name"],
+                "email": scenario["email"],
+                "phone": scenario["phone"],
+                "initial_inquiry": scenario["initial_inquiry"],
+                "status": scenario["status"],
+                "risk_level": scenario["risk_level"],
+                "last_contact_at": last_contact_at,
+                "sentiment_score": sentiment_score
+            })
+            base_times.append(base_time)
+        
+        # Insert the scenario leads in one statement, getting them back (with ids) in scenario order
+        created_leads = list(db.scalars(
+            insert(Lead).returning(Lead, sort_by_parameter_order=True),
+            lead_rows
+        ))
+        
+        # Insert every scenario's messages in a second statement keyed by the returned ids
+        message_rows = []
+        for lead, scenario, base_time in zip(created_leads, LEAD_SCENARIOS, base_times):
+            for sender_type, content, minutes_offset in scenario.get("messages", []):
+                message_rows.append({
+                    "lead_id": lead.id,
+                    "sender": SENDER_TYPES[sender_type],
+                    "content": content,
+                    "created_at": base_time + timedelta(minutes=minutes_offset)
+                })
+        
+        if message_rows:
+            db.execute(insert(Message), message_rows)
         
         # Add some additional random leads for volume
         print("🌱 Creating additional random leads...")
         
-        for _ in range(20):
-            lead = Lead(
-                name=fake.name(),
-                email=fake.email(),
-                phone=fake.phone_number()[:15],  # Limit length
-                initial_inquiry=fake.random_element([
-                    "I'm interested in dental cleaning",
-                    "Do you do emergency appointments?",
-                    "I need information about braces",
-                    "What are your office hours?",
-                    "I'm looking for a new dentist",
-                    "Can you help with tooth pain?",
-                    "I want to whiten my teeth",
-                    "Do you accept my insurance?",
-                    "I need a filling replaced",
-                    "Tell me about your services"
-                ]),
-                status=fake.random_element([
-                    LeadStatus.NEW, LeadStatus.ACTIVE, LeadStatus.COLD, 
-                    LeadStatus.CONVERTED
-                ]),
-                risk_level=fake.random_element([
-                    LeadRiskLevel.LOW, LeadRiskLevel.MEDIUM, LeadRiskLevel.HIGH
-                ]),
-                sentiment_score=fake.random.uniform(-0.8, 0.8),
-                created_at=fake.date_time_between(start_date='-60d', end_date='now'),
-                last_contact_at=fake.date_time_between(start_date='-30d', end_date='now') if fake.random.choice([True, False]) else None
+        fake = get_fake()
+        inquiries = random.choices(RANDOM_LEAD_INQUIRIES, k=RANDOM_LEAD_COUNT)
+        statuses = random.choices(RANDOM_LEAD_STATUSES, k=RANDOM_LEAD_COUNT)
+        risk_levels = random.choices(RANDOM_LEAD_RISK_LEVELS, k=RANDOM_LEAD_COUNT)
+        has_contact = random.choices([True, False], k=RANDOM_LEAD_COUNT)
+        # Distinct 555 numbers outside the scenario leads' 555-01xx range (phone is unique)
+        phones = [f"555-{number}" for number in random.sample(range(1000, 10000), RANDOM_LEAD_COUNT)]
+        
+        random_lead_rows = [
+            {
+                "name": fake.name(),
+                "email": fake.unique.email(),
+                "phone": phone,
+                "initial_inquiry": inquiry,
+                "status": status,
+                "risk_level": risk_level,
+                "sentiment_score": random.uniform(-0.8, 0.8),
+                "created_at": random_time_within(now, 60),
+                "last_contact_at": random_time_within(now, 30) if contacted else None
+            }
+            for inquiry, status, risk_level, contacted, phone in zip(
+                inquiries, statuses, risk_levels, has_contact, phones
             )
-            
-            db.add(lead)
-            created_leads.append(lead)
+        ]
+        
+        created_leads.extend(db.scalars(insert(Lead).returning(Lead), random_lead_rows))
         
         db.commit()
         
         print(f"✅ Created {len(created_leads)} sample leads successfully!")
         
         # Print summary
-        status_counts = {}
-        for lead in created_leads:
-            status = lead.status.value
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = Counter(lead.status.value for lead in created_leads)
         
         print("\n📊 Lead Status Distribution:")
-        for status, count in status_counts.items():
+        for status, count in status_counts.most_common():
             print(f"  {status.title()}: {count}")
         
         return created_leads
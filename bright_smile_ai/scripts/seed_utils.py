@@ -0,0 +1,43 @@
+"""
+Helpers shared by the seeding scripts
+"""
+import random
+from datetime import timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import DATABASE_URL
+from app.db.models import SenderType
+
+# Engine for the seeding scripts only: executemany UPDATE/DELETE also go through
+# psycopg2's fast execution helpers, and bulk INSERTs are sent as multi-row
+# VALUES pages of up to 10k rows
+seed_engine = create_engine(
+    DATABASE_URL,
+    pool_pre_ping=True,
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=10_000,
+    echo=False
+)
+
+SeedSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=seed_engine)
+
+_fake = None
+
+# Scenario sender labels -> message sender enum
+SENDER_TYPES = {"lead": SenderType.LEAD, "ai": SenderType.AI, "human": SenderType.HUMAN}
+
+
+def random_time_within(now, days):
+    """Return a random moment in the `days` days before `now`"""
+    return now - timedelta(seconds=random.uniform(0, days * 86400))
+
+
+def get_fake():
+    """Create the shared Faker instance on first use (loading its providers is slow)"""
+    global _fake
+    if _fake is None:
+        from faker import Faker
+        # Uniform picks skip the weighted-distribution math; seed data needs no realistic frequencies
+        _fake = Faker(use_weighting=False)
+    return _fake
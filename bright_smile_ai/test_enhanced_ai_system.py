@@ -5,167 +5,216 @@ This demonstrates the new functionality for AI lead scanning and aggressive rete
 """
 
 import asyncio
-import json
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+import contextlib
+import sys
+from collections import Counter
+
+import openai
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
 
 from app.db.base import get_db
 from app.services.engagement_engine import EngagementEngine
 from app.services.risk_analyzer import RiskAnalyzer
-from app.services.system_logger import SystemLogger
-from app.db.models import Lead, Message, LeadStatus, LeadRiskLevel, SenderType
+from app.db.models import Lead, LeadStatus
+
+
+# Failures meaning the database or the LLM API is unavailable; once one is seen the remaining tests are skipped
+INFRA_ERRORS = (
+    OperationalError,
+    openai.APIConnectionError,
+    openai.AuthenticationError,
+    openai.RateLimitError,
+)
+
+
+# Services built once per session and reused by every test
+_services = {}
+
+
+# get_db() as a context manager, so its own cleanup runs on success and on error
+get_db_session = contextlib.contextmanager(get_db)
+
+
+@contextlib.contextmanager
+def shared_db():
+    """Open one database session for the whole test run"""
+    with get_db_session() as db:
+        try:
+            yield db
+        finally:
+            _services.pop(id(db), None)
+
+
+def get_services(db):
+    """Return the (EngagementEngine, RiskAnalyzer) pair for this session, building it on first use"""
+    services = _services.get(id(db))
+    if services is None:
+        engine = EngagementEngine(db)
+        services = _services[id(db)] = (engine, RiskAnalyzer(db, engagement_engine=engine))
+    return services
+
+
+def _failed(db, e):
+    """Roll back the shared session after a test error and describe the failure"""
+    db.rollback()  # Keep the shared session usable for the next test
+    return {"error": str(e), "infra_down": isinstance(e, INFRA_ERRORS)}
+
+
+def _fetch_active_lead(db):
+    """Return any ACTIVE lead, or None"""
+    return db.scalar(select(Lead).where(Lead.status == LeadStatus.ACTIVE).limit(1))
+
+
+def _successful(result):
+    """Return a test result only if it completed without error"""
+    if result and "error" not in result:
+        return result
+    return None
 
 
-async def test_ai_lead_scanning():
+async def test_ai_lead_scanning(db):
     """Test the AI-powered lead scanning functionality"""
     print("🔍 Testing AI-powered lead scanning...")
     
-    db = next(get_db())
     try:
-        # Initialize services
-        engine = EngagementEngine(db)
-        risk_analyzer = RiskAnalyzer(db, engagement_engine=engine)
+        # Get the shared services
+        engine, risk_analyzer = get_services(db)
         
         # Run AI lead scanning
         results = await risk_analyzer.scan_all_leads_for_opportunities()
         
-        print(f"✅ AI Lead Scanning Results:")
-        print(f"   - Total leads scanned: {results['total_scanned']}")
-        print(f"   - Opportunities identified: {results['opportunities_identified']}")
-        print(f"   - Proactive messages sent: {results['proactive_messages_sent']}")
-        print(f"   - Leads escalated: {results['leads_escalated']}")
+        print("\n".join([
+            f"✅ AI Lead Scanning Results:",
+            f"   - Total leads scanned: {results['total_scanned']}",
+            f"   - Opportunities identified: {results['opportunities_identified']}",
+            f"   - Proactive messages sent: {results['proactive_messages_sent']}",
+            f"   - Leads escalated: {results['leads_escalated']}"
+        ]))
         
         return results
         
     except Exception as e:
         print(f"❌ AI lead scanning failed: {e}")
-        return None
-    finally:
-        db.close()
+        return _failed(db, e)
 
 
-async def test_enhanced_risk_analysis():
+async def test_enhanced_risk_analysis(db):
     """Test the enhanced risk analysis with aggressive retention offers"""
     print("\n⚠️  Testing Enhanced Risk Analysis...")
     
-    db = next(get_db())
     try:
-        # Initialize services
-        engine = EngagementEngine(db)
-        risk_analyzer = RiskAnalyzer(db, engagement_engine=engine)
+        # Get the shared services
+        engine, risk_analyzer = get_services(db)
         
         # Run enhanced risk analysis
         results = await risk_analyzer.analyze_all_active_leads()
         
-        print(f"✅ Enhanced Risk Analysis Results:")
-        print(f"   - Total leads analyzed: {results['total_analyzed']}")
-        print(f"   - Newly at risk: {results['newly_at_risk']}")
-        print(f"   - Interventions triggered: {results['interventions_triggered']}")
-        print(f"   - Aggressive offers sent: {results['aggressive_offers_sent']}")
-        print(f"   - Moved to cold: {results['moved_to_cold']}")
+        print("\n".join([
+            f"✅ Enhanced Risk Analysis Results:",
+            f"   - Total leads analyzed: {results['total_analyzed']}",
+            f"   - Newly at risk: {results['newly_at_risk']}",
+            f"   - Interventions triggered: {results['interventions_triggered']}",
+            f"   - Aggressive offers sent: {results['aggressive_offers_sent']}",
+            f"   - Moved to cold: {results['moved_to_cold']}"
+        ]))
         
         return results
         
     except Exception as e:
         print(f"❌ Enhanced risk analysis failed: {e}")
-        return None
-    finally:
-        db.close()
+        return _failed(db, e)
 
 
-async def test_ai_outreach_strategies():
+async def test_ai_outreach_strategies(db):
     """Test the AI-powered outreach strategy selection"""
     print("\n📧 Testing AI-powered Outreach Strategies...")
     
-    db = next(get_db())
     try:
-        # Initialize engagement engine
-        engine = EngagementEngine(db)
+        # Get the shared engagement engine
+        engine, _ = get_services(db)
         
         # Run AI-powered outreach campaign
         results = await engine.run_proactive_outreach_campaign()
         
-        print(f"✅ AI Outreach Campaign Results:")
-        print(f"   - Leads processed: {results['leads_processed']}")
-        print(f"   - Leads contacted: {results['leads_contacted']}")
-        print(f"   - Leads skipped: {results['leads_skipped']}")
-        print(f"   - AI strategies executed: {results['ai_strategies_selected']}")
+        print("\n".join([
+            f"✅ AI Outreach Campaign Results:",
+            f"   - Leads processed: {results['leads_processed']}",
+            f"   - Leads contacted: {results['leads_contacted']}",
+            f"   - Leads skipped: {results['leads_skipped']}",
+            f"   - AI strategies executed: {results['ai_strategies_selected']}"
+        ]))
         
         return results
         
     except Exception as e:
         print(f"❌ AI outreach campaign failed: {e}")
-        return None
-    finally:
-        db.close()
+        return _failed(db, e)
 
 
-async def test_comprehensive_analysis():
-    """Test the comprehensive AI analysis combining all systems"""
+async def test_comprehensive_analysis(db, scan_results, risk_results):
+    """
+    Test the comprehensive AI analysis combining all systems.
+    Combines the results of the scan and risk tests run before it; it never scans
+    again itself, since every scan sends real messages.
+    """
     print("\n🚀 Testing Comprehensive AI Analysis...")
     
-    db = next(get_db())
     try:
-        # Initialize services
-        engine = EngagementEngine(db)
-        risk_analyzer = RiskAnalyzer(db, engagement_engine=engine)
-        
-        # Run comprehensive analysis
-        scan_results = await risk_analyzer.scan_all_leads_for_opportunities()
-        risk_results = await risk_analyzer.analyze_all_active_leads()
+        if not (_successful(scan_results) and _successful(risk_results)):
+            raise RuntimeError("needs passing AI Lead Scanning and Enhanced Risk Analysis results")
         
-        # Combine results
+        # Combine results (both are flat dicts of counts)
+        totals = Counter(scan_results) + Counter(risk_results)
         comprehensive_results = {
             "ai_lead_scanning": scan_results,
             "risk_analysis": risk_results,
-            "total_opportunities": scan_results["opportunities_identified"] + risk_results["aggressive_offers_sent"],
-            "total_interventions": scan_results["proactive_messages_sent"] + risk_results["interventions_triggered"],
-            "leads_escalated": scan_results["leads_escalated"]
+            "total_opportunities": totals["opportunities_identified"] + totals["aggressive_offers_sent"],
+            "total_interventions": totals["proactive_messages_sent"] + totals["interventions_triggered"],
+            "leads_escalated": totals["leads_escalated"]
         }
         
-        print(f"✅ Comprehensive AI Analysis Results:")
-        print(f"   - Total opportunities identified: {comprehensive_results['total_opportunities']}")
-        print(f"   - Total interventions executed: {comprehensive_results['total_interventions']}")
-        print(f"   - Leads escalated to human: {comprehensive_results['leads_escalated']}")
-        print(f"   - AI lead scanning opportunities: {scan_results['opportunities_identified']}")
-        print(f"   - Risk analysis aggressive offers: {risk_results['aggressive_offers_sent']}")
+        print("\n".join([
+            f"✅ Comprehensive AI Analysis Results:",
+            f"   - Total opportunities identified: {comprehensive_results['total_opportunities']}",
+            f"   - Total interventions executed: {comprehensive_results['total_interventions']}",
+            f"   - Leads escalated to human: {comprehensive_results['leads_escalated']}",
+            f"   - AI lead scanning opportunities: {scan_results['opportunities_identified']}",
+            f"   - Risk analysis aggressive offers: {risk_results['aggressive_offers_sent']}"
+        ]))
         
         return comprehensive_results
         
     except Exception as e:
         print(f"❌ Comprehensive analysis failed: {e}")
-        return None
-    finally:
-        db.close()
+        return _failed(db, e)
 
 
-async def test_instant_reply_agent():
-    """Test the instant reply agent with a sample message"""
+async def test_instant_reply_agent(db, lead):
+    """Test the instant reply agent with a sample message to the given lead"""
     print("\n💬 Testing Instant Reply Agent...")
     
-    db = next(get_db())
     try:
-        # Get a sample lead
-        lead = db.query(Lead).filter(Lead.status == LeadStatus.ACTIVE).first()
-        
         if not lead:
             print("⚠️  No active leads found for testing")
             return None
         
-        # Initialize engagement engine
-        engine = EngagementEngine(db)
+        # Get the shared engagement engine
+        engine, _ = get_services(db)
         
         # Test instant reply
         test_message = "Hi, I'm interested in getting a consultation. What are your prices like?"
         result = await engine.invoke_new_message(lead.id, test_message)
         
         if result["success"]:
-            print(f"✅ Instant Reply Agent Test Results:")
-            print(f"   - Lead: {lead.name}")
-            print(f"   - Test message: {test_message}")
-            print(f"   - Intent classified: {result['intent']}")
-            print(f"   - Handoff required: {result['handoff_required']}")
-            print(f"   - Response: {result['response'][:100]}...")
+            print("\n".join([
+                f"✅ Instant Reply Agent Test Results:",
+                f"   - Lead: {lead.name}",
+                f"   - Test message: {test_message}",
+                f"   - Intent classified: {result['intent']}",
+                f"   - Handoff required: {result['handoff_required']}",
+                f"   - Response: {result['response'][:100]}..."
+            ]))
         else:
             print(f"❌ Instant reply failed: {result.get('error')}")
         
@@ -173,9 +222,35 @@ async def test_instant_reply_agent():
         
     except Exception as e:
         print(f"❌ Instant reply test failed: {e}")
-        return None
-    finally:
-        db.close()
+        return _failed(db, e)
+
+
+# Argument builders: each gets (db, results so far, sample lead) and returns the test's arguments
+def _db_args(db, results, sample_lead):
+    return (db,)
+
+
+def _earlier_results_args(db, results, sample_lead):
+    return (db, results.get("AI Lead Scanning"), results.get("Enhanced Risk Analysis"))
+
+
+def _sample_lead_args(db, results, sample_lead):
+    # Earlier tests may have moved the sample lead out of ACTIVE (e.g. to COLD or HUMAN_HANDOFF)
+    if sample_lead is not None:
+        db.refresh(sample_lead)
+    if sample_lead is None or sample_lead.status != LeadStatus.ACTIVE:
+        sample_lead = _fetch_active_lead(db)
+    return (db, sample_lead)
+
+
+# Test all components, in run order, with the builder for each test's arguments
+TESTS = (
+    ("AI Lead Scanning", test_ai_lead_scanning, _db_args),
+    ("Enhanced Risk Analysis", test_enhanced_risk_analysis, _db_args),
+    ("AI Outreach Strategies", test_ai_outreach_strategies, _db_args),
+    ("Comprehensive Analysis", test_comprehensive_analysis, _earlier_results_args),
+    ("Instant Reply Agent", test_instant_reply_agent, _sample_lead_args),
+)
 
 
 async def main():
@@ -183,32 +258,33 @@ async def main():
     print("🧪 Testing Enhanced AI-Powered Lead Management System")
     print("=" * 60)
     
-    # Test all components
-    tests = [
-        ("AI Lead Scanning", test_ai_lead_scanning),
-        ("Enhanced Risk Analysis", test_enhanced_risk_analysis),
-        ("AI Outreach Strategies", test_ai_outreach_strategies),
-        ("Comprehensive Analysis", test_comprehensive_analysis),
-        ("Instant Reply Agent", test_instant_reply_agent)
-    ]
-    
     results = {}
     
-    for test_name, test_func in tests:
-        try:
-            result = await test_func()
-            results[test_name] = result
-        except Exception as e:
-            print(f"❌ {test_name} test failed with exception: {e}")
-            results[test_name] = {"error": str(e)}
+    with shared_db() as db:
+        # Fetch the sample lead once up front for the tests that message a lead
+        sample_lead = _fetch_active_lead(db)
+        
+        for test_name, test_func, build_args in TESTS:
+            try:
+                result = await test_func(*build_args(db, results, sample_lead))
+                results[test_name] = result
+            except Exception as e:
+                print(f"❌ {test_name} test failed with exception: {e}")
+                result = results[test_name] = {"error": str(e), "infra_down": isinstance(e, INFRA_ERRORS)}
+            
+            if result and result.get("infra_down"):
+                print("\n🛑 Database or LLM API unavailable, skipping the remaining tests")
+                break
     
     # Summary
     print("\n" + "=" * 60)
     print("📊 Test Summary")
     print("=" * 60)
     
-    for test_name, result in results.items():
-        if result and "error" not in result:
+    for test_name, _, _ in TESTS:
+        if test_name not in results:
+            print(f"⏭️  {test_name}: SKIPPED")
+        elif _successful(results[test_name]):
             print(f"✅ {test_name}: PASSED")
         else:
             print(f"❌ {test_name}: FAILED")
@@ -224,5 +300,14 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Run the tests
-    asyncio.run(main()) 
\ No newline at end of file
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
+    # Run the tests, exiting with status 2 when the suite stopped on unavailable infrastructure
+    results = asyncio.run(main())
+    if any(result and result.get("infra_down") for result in results.values()):
+        sys.exit(2) 
\ No newline at end of file